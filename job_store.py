@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class JobStore:
+    """Durable record of pipeline jobs and summary state (SQLite in WAL mode).
+
+    Every job moves through queued -> running -> done | failed; the payload holds what is
+    needed to run it again (segment metadata, transcript). Small JSON values such as the
+    rolling summary are kept in a key/value state table. A killed recorder leaves its
+    unfinished jobs behind, and unfinished() returns them so the session can be resumed.
+
+    One database can be shared by several recorders and remote transcription workers (e.g. on a
+    shared volume): `session` scopes a recorder's queries to its own jobs. WAL keeps its index in
+    shared memory and only works when every connection is on the same host, so a store shared
+    between machines must be opened with shared=True (rollback journal, journal_mode=DELETE); it then
+    relies on the filesystem's POSIX locks, which NFS provides only with a working lock manager. Jobs enqueued with
+    remote=True are handed out by claim() under a lease that the worker renews with heartbeat();
+    a job whose lease expires (worker died) is claimed again by someone else. The recorder picks
+    up finished remote jobs with uncollected() and acknowledges them with mark_collected().
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, db_path, timeout=30, session=None, shared=False):
+        self.db_path = db_path
+        self.session = session
+        self.shared = shared
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if shared:
+            self._conn.execute("PRAGMA journal_mode=DELETE")
+            self._conn.execute("PRAGMA synchronous=FULL")
+        else:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                stage TEXT NOT NULL,
+                segment_path TEXT,
+                segment_index INTEGER,
+                payload TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                error TEXT,
+                result TEXT,
+                enqueued_at REAL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_stage_status ON jobs (stage, status, segment_index);
+            CREATE TABLE IF NOT EXISTS state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after the first schema to existing databases"""
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(jobs)").fetchall()}
+        for name, decl in (("session", "TEXT"), ("remote", "INTEGER NOT NULL DEFAULT 0"),
+                           ("lease_until", "REAL"), ("collected", "INTEGER NOT NULL DEFAULT 0")):
+            if name not in columns:
+                try:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {decl}")
+                except sqlite3.OperationalError:
+                    pass  # added concurrently by another process
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (stage, remote, status, lease_until)")
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, stage, segment_path, segment_index=None, payload=None, remote=False):
+        """Record a new queued job; returns its id. remote=True makes it claimable by workers."""
+        cur = self._execute(
+            "INSERT INTO jobs (stage, session, segment_path, segment_index, payload, status, remote, enqueued_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (stage, self.session, segment_path, segment_index, json.dumps(payload or {}, default=str),
+             self.QUEUED, 1 if remote else 0, time.time())
+        )
+        return cur.lastrowid
+
+    def claim(self, stage, worker, lease_s=60.0, limit=1, max_attempts=None):
+        """Atomically take up to `limit` remote jobs of a stage (any session) for `worker`.
+        Queued jobs and running jobs whose lease has expired are eligible, oldest segment first.
+        An expired job that already had `max_attempts` attempts (its worker crashed or was killed
+        each time) is marked failed instead of being handed out again."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if max_attempts:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+                        "WHERE stage = ? AND remote = 1 AND status = ? AND lease_until IS NOT NULL AND lease_until < ? "
+                        "AND attempts >= ?",
+                        (self.FAILED, f"lease expired after {int(max_attempts)} attempts", now,
+                         stage, self.RUNNING, now, int(max_attempts))
+                    )
+                rows = self._conn.execute(
+                    "SELECT * FROM jobs WHERE stage = ? AND remote = 1 AND "
+                    "(status = ? OR (status = ? AND lease_until IS NOT NULL AND lease_until < ?)) "
+                    "ORDER BY enqueued_at, segment_index, id LIMIT ?",
+                    (stage, self.QUEUED, self.RUNNING, now, int(limit))
+                ).fetchall()
+                for r in rows:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, started_at = ?, lease_until = ? WHERE id = ?",
+                        (self.RUNNING, worker, now, now + lease_s, r["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        jobs = [self._row_to_job(r) for r in rows]
+        for job in jobs:
+            job.update(status=self.RUNNING, attempts=job["attempts"] + 1, worker=worker, started_at=now, lease_until=now + lease_s)
+        return jobs
+
+    def heartbeat(self, job_ids, worker, lease_s=60.0):
+        """Extend the lease of jobs still held by worker; returns the ids that are still ours"""
+        held = []
+        for job_id in job_ids:
+            cur = self._execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + lease_s, job_id, worker, self.RUNNING)
+            )
+            if cur.rowcount:
+                held.append(job_id)
+        return held
+
+    def _fence(self, sql, params, worker):
+        """Restrict an update of a claimed job to its current holder; returns the number of rows changed"""
+        if worker is not None:
+            sql += " AND worker = ? AND status = ?"
+            params = tuple(params) + (worker, self.RUNNING)
+        return self._execute(sql, params).rowcount
+
+    def release(self, job_id, error=None, worker=None):
+        """Put a claimed job back in the queue (e.g. after a transient failure).
+        With `worker`, only if that worker still holds the job; returns whether it was released."""
+        return self._fence(
+            "UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_until = NULL WHERE id = ?",
+            (self.QUEUED, None if error is None else str(error), job_id), worker
+        ) > 0
+
+    def uncollected(self, stage):
+        """Remote jobs of this session that finished (done or failed) but were not collected yet"""
+        rows = self._execute(
+            "SELECT * FROM jobs WHERE stage = ? AND session IS ? AND remote = 1 AND collected = 0 AND status IN (?, ?) "
+            "ORDER BY segment_index, id",
+            (stage, self.session, self.DONE, self.FAILED)
+        ).fetchall()
+        return [self._row_to_job(r) for r in rows]
+
+    def mark_collected(self, job_id):
+        self._execute("UPDATE jobs SET collected = 1 WHERE id = ?", (job_id,))
+
+    def outstanding(self, stage):
+        """Jobs of this session still queued/running, or remote results not collected yet"""
+        row = self._execute(
+            "SELECT COUNT(*) FROM jobs WHERE stage = ? AND session IS ? AND "
+            "(status IN (?, ?) OR (remote = 1 AND collected = 0))",
+            (stage, self.session, self.QUEUED, self.RUNNING)
+        ).fetchone()
+        return row[0]
+
+    def start(self, job_id, worker=None):
+        self._execute(
+            "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, started_at = ? WHERE id = ?",
+            (self.RUNNING, worker, time.time(), job_id)
+        )
+
+    def finish(self, job_id, result=None, worker=None):
+        """Mark a job done; result is stored as JSON. With `worker`, only if that worker still holds
+        the job (its lease may have expired and the job been claimed by another); returns whether it was updated."""
+        return self._fence(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, lease_until = NULL WHERE id = ?",
+            (self.DONE, json.dumps(result), time.time(), job_id), worker
+        ) > 0
+
+    def fail(self, job_id, error, worker=None):
+        return self._fence(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+            (self.FAILED, str(error), time.time(), job_id), worker
+        ) > 0
+
+    def _row_to_job(self, row):
+        job = dict(row)
+        for field, empty in (("payload", {}), ("result", None)):
+            try:
+                job[field] = json.loads(job[field]) if job.get(field) else empty
+            except ValueError:
+                pass  # plain-text value
+        return job
+
+    def unfinished(self, stage):
+        """Queued or running (interrupted) jobs of a stage, in segment order"""
+        rows = self._execute(
+            "SELECT * FROM jobs WHERE stage = ? AND session IS ? AND status IN (?, ?) ORDER BY segment_index, id",
+            (stage, self.session, self.QUEUED, self.RUNNING)
+        ).fetchall()
+        return [self._row_to_job(r) for r in rows]
+
+    def indices(self, stage, statuses=None, uncollected=False):
+        """Segment indices of a stage's jobs, optionally limited to some statuses / uncollected remote jobs"""
+        sql = "SELECT DISTINCT segment_index FROM jobs WHERE stage = ? AND session IS ? AND segment_index IS NOT NULL"
+        params = [stage, self.session]
+        if statuses:
+            sql += f" AND status IN ({','.join('?' * len(statuses))})"
+            params += list(statuses)
+        if uncollected:
+            sql += " AND remote = 1 AND collected = 0"
+        return {r[0] for r in self._execute(sql, params).fetchall()}
+
+    def counts(self):
+        """{stage: {status: n}} for this session"""
+        out = {}
+        for stage, status, n in self._execute("SELECT stage, status, COUNT(*) FROM jobs WHERE session IS ? GROUP BY stage, status",
+                                              (self.session,)).fetchall():
+            out.setdefault(stage, {})[status] = n
+        return out
+
+    def _state_key(self, key):
+        return f"{self.session}|{key}" if self.session else key
+
+    def get_state(self, key, default=None):
+        row = self._execute("SELECT value FROM state WHERE key = ?", (self._state_key(key),)).fetchone()
+        if row is None:
+            return default
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return default
+
+    def set_state(self, key, value):
+        self._execute(
+            "INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (self._state_key(key), json.dumps(value, default=str))
+        )
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
@@ -7,18 +7,22 @@ import argparse
 import subprocess
 import sys
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 import yaml
 import json
 
 from audio_sources import find_system_audio_source, find_microphone_source, list_audio_sources
 from rec_utils import check_dependencies, save_recording_metadata, get_file_duration, get_file_size_mb, post_process_audio
 from processing_pipeline import ProcessingPipeline
+from pipeline_engine import PipelineEngine
+from stream_capture import StreamingCapture
 
 class MeetingRecorder:
     def __init__(self, output_dir="~/Recordings/Meetings",
                 source_system=None, source_mic=None, combined=True, custom_name=None, segment_duration=300,
-                automation_enabled=False, metrics_enabled=False, metrics_dir_name="metrics", summary_batch_size=1):
+                automation_enabled=False, metrics_enabled=False, metrics_dir_name="metrics", summary_batch_size=1,
+                transcription_workers=1, segment_monitor="list", capture_mode="segments", segmentation="fixed",
+                vad_options=None):
         # Always use WAV for processing
         self.output_dir = os.path.expanduser(output_dir)
         self.format = "wav"  # Forced WAV
@@ -31,16 +35,34 @@ class MeetingRecorder:
         self.automation_enabled = automation_enabled
         self.metrics_enabled = metrics_enabled
         self.metrics_dir_name = metrics_dir_name
+        # "list": ffmpeg reports closed segments over a pipe; "poll": glob the segments dir
+        self.segment_monitor = segment_monitor
+        # "segments": ffmpeg segment muxer writes WAVs; "stream": raw PCM over stdout, cut in process
+        self.capture_mode = capture_mode
+        self._capture = None
+        # "fixed" or "vad" (cut at pauses; requires in-process cutting, i.e. stream capture)
+        self.segmentation = segmentation
+        self.vad_options = dict(vad_options or {})
+        if self.segmentation == "vad" and self.capture_mode != "stream":
+            print("[Recorder] VAD segmentation cuts audio in process; switching to --capture-mode stream")
+            self.capture_mode = "stream"
         
         # Initialize state variables
         self.ffmpeg_process = None
+        self._segment_monitor_thread = None
+        self._monitor_stop = None  # set by stop_recording to end this session's polling monitor
         self.recording = False
         self.recording_started = None
         self.current_session_dir = None  # Root of session directory hierarchy
         self.session_metadata_path = None
-        self.pipeline = ProcessingPipeline(automation_enabled=automation_enabled, summary_batch_size=summary_batch_size)
+        self.pipeline = ProcessingPipeline(automation_enabled=automation_enabled, summary_batch_size=summary_batch_size,
+                                           transcription_workers=transcription_workers)
         self.pipeline.metrics_enabled = metrics_enabled
         self.pipeline.metrics_dir_name = metrics_dir_name
+        self.drain_timeout = None  # seconds stop_recording waits for queued jobs (None: until done)
+        # Sessions being finalized in the background: session_dir -> {thread, pipeline, started, state}
+        self._finalizers = {}
+        self.engine = None  # PipelineEngine shared by all sessions (enable_shared_engine)
         
         # Setup base output dir
         os.makedirs(self.output_dir, exist_ok=True)
@@ -64,6 +86,7 @@ class MeetingRecorder:
         """Handle interrupt signals"""
         print("\nShutting down recorder...")
         self.stop_recording()
+        self.wait_for_finalization()
         sys.exit(0)
     
     def get_audio_sources(self):
@@ -141,7 +164,7 @@ class MeetingRecorder:
     def start_recording(self, name=None):
         """Start recording with segmentation into structured hierarchy"""
         if self.ffmpeg_process:
-            self.stop_recording()
+            self.stop_recording(background=True)
         # Create date folder
         date_folder = datetime.now().strftime("%Y-%m-%d")
         date_dir = os.path.join(self.output_dir, date_folder)
@@ -174,12 +197,21 @@ class MeetingRecorder:
         # Get audio input arguments
         input_args = self.get_audio_sources()
         self.debug(f"FFmpeg input args: {input_args}")
+        if self.capture_mode == "stream":
+            return self._start_stream_capture(input_args, session_dir, segments_dir)
+        list_read_fd = list_write_fd = None
         try:
+            segment_list_args = []
+            if self.segment_monitor == "list":
+                # ffmpeg appends "filename,start,end" to this pipe the moment it closes a segment
+                list_read_fd, list_write_fd = os.pipe()
+                segment_list_args = ["-segment_list", f"pipe:{list_write_fd}", "-segment_list_type", "csv"]
             cmd = [
                 "ffmpeg", "-v", "warning", "-stats",
                 *input_args,
                 "-c:a", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                "-f", "segment", "-segment_time", str(self.segment_duration), filename_pattern
+                "-f", "segment", "-segment_time", str(self.segment_duration),
+                *segment_list_args, filename_pattern
             ]
             self.debug(f"FFmpeg command: {' '.join(cmd)}")
             print(f"Starting segmented recording: {session_dir}")
@@ -187,8 +219,20 @@ class MeetingRecorder:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                pass_fds=(list_write_fd,) if list_write_fd is not None else ()
             )
+            if list_write_fd is not None:
+                # Only ffmpeg keeps the write end open, so the reader sees EOF when it exits
+                os.close(list_write_fd)
+                list_write_fd = None
+                self._segment_monitor_thread = threading.Thread(
+                    target=self._monitor_segment_list,
+                    args=(list_read_fd, segments_dir, self.recording_started, self.pipeline),
+                    daemon=True
+                )
+                list_read_fd = None
+                self._segment_monitor_thread.start()
             time.sleep(1)
             if self.ffmpeg_process.poll() is not None:
                 print(f"Error: ffmpeg failed to start (exit code {self.ffmpeg_process.returncode})")
@@ -197,21 +241,77 @@ class MeetingRecorder:
                 return False
             self.recording = True
             
-            # Monitor segments
-            self._segment_monitor_thread = threading.Thread(
-                target=self._monitor_segments,
-                args=(segments_dir, filename_pattern, self.recording_started),
-                daemon=True
-            )
-            self._segment_monitor_thread.start()
+            # Monitor segments (polling fallback)
+            if self._segment_monitor_thread is None:
+                # Per-session stop event: self.recording is True again as soon as the next session starts
+                self._monitor_stop = threading.Event()
+                self._segment_monitor_thread = threading.Thread(
+                    target=self._monitor_segments,
+                    args=(segments_dir, filename_pattern, self.recording_started, self.pipeline, self._monitor_stop),
+                    daemon=True
+                )
+                self._segment_monitor_thread.start()
             
             if self.automation_enabled:
                 self.pipeline.start()
             return True
         except Exception as e:
             print(f"Error starting recording: {e}")
+            for fd in (list_read_fd, list_write_fd):
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
             return False
 
+    def _start_stream_capture(self, input_args, session_dir, segments_dir):
+        """Streaming capture: segments are cut from ffmpeg's PCM stdout and handed over in memory"""
+        start_time = self.recording_started
+        pipeline = self.pipeline  # segments of this session go to its pipeline even after a new one starts
+        try:
+            self._capture = StreamingCapture(
+                input_args, segments_dir, self.segment_duration,
+                on_segment=lambda *seg: self._on_stream_segment(pipeline, start_time, *seg),
+                pre_roll_ms=self.pipeline.pre_roll_ms,
+                on_persisted=self.log_recording,
+                segmentation=self.segmentation,
+                log_path=os.path.join(session_dir, 'ffmpeg.log'),
+                **self.vad_options
+            )
+            self.debug(f"FFmpeg command: {' '.join(self._capture.build_command())}")
+            print(f"Starting streaming recording: {session_dir}")
+            self.ffmpeg_process = self._capture.start()
+            time.sleep(1)
+            if self.ffmpeg_process.poll() is not None:
+                print(f"Error: ffmpeg failed to start (exit code {self.ffmpeg_process.returncode})")
+                error_output = self._capture.error_output()
+                if error_output:
+                    print(error_output)
+                print("Available PulseAudio sources:")
+                list_audio_sources()
+                return False
+            self.recording = True
+            if self.automation_enabled:
+                self.pipeline.start()
+            return True
+        except Exception as e:
+            print(f"Error starting recording: {e}")
+            return False
+
+    def _on_stream_segment(self, pipeline, start_time, index, pcm, pre_roll, seg_start, seg_end, info=None):
+        path = self._capture.segment_path(index)
+        metadata = self._segment_metadata(path, start_time)
+        metadata["segment_start_s"] = round(seg_start, 3)
+        metadata["segment_end_s"] = round(seg_end, 3)
+        metadata["segment_start_time"] = (start_time + timedelta(seconds=seg_start)).isoformat()
+        metadata["capture_mode"] = "stream"
+        if info:
+            metadata.update(info)
+        save_recording_metadata(path, metadata)
+        if self.automation_enabled:
+            pipeline.enqueue_segment(path, metadata, audio={"pcm": pcm, "pre_roll": pre_roll})
+
     def _wait_for_stable_file(self, path, min_size=1024, stable_time=1.0, timeout=10):
         """Wait until file exists, is nonzero, and size is stable for stable_time seconds.
         For segment files, also verify audio duration matches expected segment duration."""
@@ -242,15 +342,10 @@ class MeetingRecorder:
                     # For segment files, also verify audio duration
                     if size_stable and is_segment_file and expected_duration:
                         try:
-                            # Get actual audio duration
-                            import subprocess
-                            result = subprocess.run([
-                                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                                '-of', 'csv=p=0', path
-                            ], capture_output=True, text=True, timeout=5)
+                            # Get actual audio duration (RIFF header, cached)
+                            actual_duration = get_file_duration(path)
                             
-                            if result.returncode == 0:
-                                actual_duration = float(result.stdout.strip())
+                            if actual_duration is not None:
                                 # Allow segment to be slightly shorter due to end-of-stream
                                 if actual_duration >= (expected_duration - 2.0):
                                     self.debug(f"Segment {path} ready: {actual_duration:.1f}s (expected {expected_duration}s)")
@@ -261,7 +356,7 @@ class MeetingRecorder:
                                     stable_since = None
                                     continue
                             else:
-                                # If ffprobe fails, fall back to size-only check
+                                # If the duration cannot be read, fall back to size-only check
                                 self.debug(f"Could not probe {path}, using size-only check")
                                 return True
                         except Exception as e:
@@ -274,40 +369,84 @@ class MeetingRecorder:
             time.sleep(0.2)
         return False
 
-    def _monitor_segments(self, segments_dir, filename_pattern, start_time):
+    def _segment_metadata(self, path, start_time):
+        """Build the per-segment metadata dict for a segment file"""
+        idx = os.path.splitext(os.path.basename(path))[0].split('_')[-1]
+        return {
+            "segment_path": path,
+            "start_time": start_time.isoformat(),
+            "segment_index": idx,
+            "sources": {
+                "system": self.system_source,
+                "mic": self.mic_source,
+                "combined": self.combined
+            },
+            "format": self.format
+        }
+
+    def _wait_for_segment_closed(self, path, expected_s, timeout=2.0):
+        """Segment-list entries are written as ffmpeg finalizes the file; allow a moment for the
+        header/data to reach disk before handing the segment on."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            duration = get_file_duration(path)
+            if duration is not None and duration >= expected_s - 0.5:
+                return True
+            time.sleep(0.05)
+        return os.path.exists(path)
+
+    def _monitor_segment_list(self, read_fd, segments_dir, start_time, pipeline):
+        """Consume ffmpeg's CSV segment list and enqueue each segment as soon as it is closed."""
+        import csv
+        with os.fdopen(read_fd, 'r', newline='') as pipe:
+            for row in csv.reader(pipe):
+                if len(row) < 3:
+                    continue
+                try:
+                    seg_start, seg_end = float(row[1]), float(row[2])
+                except ValueError:
+                    continue
+                f = row[0] if os.path.isabs(row[0]) else os.path.join(segments_dir, os.path.basename(row[0]))
+                self.log_recording(f)
+                metadata = self._segment_metadata(f, start_time)
+                metadata["segment_start_s"] = round(seg_start, 3)
+                metadata["segment_end_s"] = round(seg_end, 3)
+                metadata["segment_start_time"] = (start_time + timedelta(seconds=seg_start)).isoformat()
+                save_recording_metadata(f, metadata)
+                if self.automation_enabled:
+                    if self._wait_for_segment_closed(f, seg_end - seg_start):
+                        pipeline.enqueue_segment(f, metadata)
+                    else:
+                        print(f"[Recorder][WARN] Segment {f} listed by ffmpeg but not found, skipping automation.")
+                        pipeline.mark_segment_skipped(metadata["segment_index"])
+
+    def _monitor_segments(self, segments_dir, filename_pattern, start_time, pipeline, stop_event):
         import glob
         seen = set()
         pattern = filename_pattern.replace('%03d', '*')
-        while self.recording:
+        while not stop_event.is_set():
             files = sorted(glob.glob(pattern))
             for f in files:
                 if f not in seen and os.path.exists(f):
                     seen.add(f)
                     self.log_recording(f)
-                    idx = os.path.splitext(os.path.basename(f))[0].split('_')[-1]
-                    metadata = {
-                        "segment_path": f,
-                        "start_time": start_time.isoformat(),
-                        "segment_index": idx,
-                        "sources": {
-                            "system": self.system_source,
-                            "mic": self.mic_source,
-                            "combined": self.combined
-                        },
-                        "format": self.format
-                    }
+                    metadata = self._segment_metadata(f, start_time)
+                    idx = metadata["segment_index"]
                     save_recording_metadata(f, metadata)
                     if self.automation_enabled:
                         # Use longer timeout for segment files that need to reach full duration
                         timeout = self.segment_duration + 10 if '/segments/' in f else 10
                         if self._wait_for_stable_file(f, min_size=1024, stable_time=1.0, timeout=timeout):
-                            self.pipeline.enqueue_segment(f, metadata)
+                            pipeline.enqueue_segment(f, metadata)
                         else:
                             print(f"[Recorder][WARN] Segment {f} did not become stable/complete in time, skipping automation.")
-            time.sleep(2)
+                            pipeline.mark_segment_skipped(idx)
+            stop_event.wait(2)
 
-    def stop_recording(self, post_process=False, drain=True):
-        """Stop the current recording session, optionally drain pipeline."""
+    def stop_recording(self, post_process=False, drain=True, background=False):
+        """Stop the current recording session, optionally drain pipeline.
+        With background=True the session is finalized in a separate thread (see print_status) and
+        the next recording gets a fresh pipeline right away."""
         if not self.ffmpeg_process:
             return
         now = datetime.now()
@@ -324,6 +463,18 @@ class MeetingRecorder:
         self.ffmpeg_process = None
         self.recording = False
         print(f"{time_str} Recording stopped")
+        # Streaming capture: cut the final partial segment and flush pending WAV writes
+        if self._capture:
+            self._capture.finish()
+            self._capture = None
+        # Segment-list monitor exits at EOF once ffmpeg has reported the final segment;
+        # the polling monitor is told to stop before the next session reuses the recorder
+        if self._monitor_stop:
+            self._monitor_stop.set()
+            self._monitor_stop = None
+        if self._segment_monitor_thread:
+            self._segment_monitor_thread.join(timeout=5)
+        self._segment_monitor_thread = None
         
         # Session duration
         duration = None
@@ -354,21 +505,18 @@ class MeetingRecorder:
         self._write_session_metadata(extra=extra)
         
         # Graceful drain: wait for pipeline to finish queued work
-        if drain and self.automation_enabled:
-            self.pipeline.drain()
-        
-        # Final summary generation (copy rolling_summary if exists)
-        summaries_dir = os.path.join(self.current_session_dir, 'summaries') if self.current_session_dir else None
-        if summaries_dir and os.path.isdir(summaries_dir):
-            rolling_path = os.path.join(summaries_dir, 'rolling_summary.md')
-            final_path = os.path.join(summaries_dir, 'final_summary.md')
-            if os.path.exists(rolling_path):
-                try:
-                    with open(rolling_path, 'r') as rf, open(final_path, 'w') as wf:
-                        wf.write(rf.read())
-                    print(f"Final summary saved: {final_path}")
-                except Exception as e:
-                    print(f"[Recorder][WARN] Could not create final summary: {e}")
+        pipeline = self.pipeline if drain and self.automation_enabled else None
+        if pipeline and background and self.current_session_dir:
+            # Hand this session's pipeline to a finalizer; the next recording starts with a fresh one
+            self.pipeline = pipeline.new_session_pipeline()
+            session_dir = self.current_session_dir
+            thread = threading.Thread(target=self._finalize_session, args=(session_dir, pipeline, True),
+                                      name=f"finalize-{os.path.basename(session_dir)}", daemon=True)
+            self._finalizers[session_dir] = {"thread": thread, "pipeline": pipeline, "started": time.monotonic(), "state": "draining"}
+            thread.start()
+            print(f"Finalizing {session_dir} in the background ('status' shows progress)")
+        else:
+            self._finalize_session(self.current_session_dir, pipeline)
         
         # Print session summary
         if self.current_session_dir:
@@ -390,6 +538,77 @@ class MeetingRecorder:
         self.current_session_dir = None
         self.session_metadata_path = None
     
+    def _finalize_session(self, session_dir, pipeline=None, stop_pipeline=False):
+        """Drain the session's pipeline (final transcript and summary) and write final_summary.md."""
+        record = self._finalizers.get(session_dir, {})
+        try:
+            if pipeline:
+                drained = pipeline.drain(timeout=self.drain_timeout)
+                record["state"] = "done" if drained else "timed out"
+            # Final summary generation (copy rolling_summary if exists)
+            summaries_dir = os.path.join(session_dir, 'summaries') if session_dir else None
+            if summaries_dir and os.path.isdir(summaries_dir):
+                rolling_path = os.path.join(summaries_dir, 'rolling_summary.md')
+                final_path = os.path.join(summaries_dir, 'final_summary.md')
+                if os.path.exists(rolling_path):
+                    try:
+                        with open(rolling_path, 'r') as rf, open(final_path, 'w') as wf:
+                            wf.write(rf.read())
+                        print(f"Final summary saved: {final_path}")
+                    except Exception as e:
+                        print(f"[Recorder][WARN] Could not create final summary: {e}")
+        except Exception as e:
+            record["state"] = f"failed: {e}"
+            print(f"[Recorder][ERROR] Finalizing {session_dir} failed: {e}")
+        finally:
+            if pipeline and stop_pipeline:
+                pipeline.stop()
+
+    def wait_for_finalization(self):
+        """Block until every session handed to a background finalizer is done."""
+        for session_dir, fin in list(self._finalizers.items()):
+            if fin["thread"].is_alive():
+                print(f"Waiting for {session_dir} to finish processing...")
+                fin["thread"].join()
+            self._finalizers.pop(session_dir, None)
+
+    def enable_shared_engine(self, llm_slots=2):
+        """Run every session's pipeline on one PipelineEngine built from the configured pipeline.
+
+        The managed whisper server, pywhispercpp models and HTTP pools are started once and kept
+        warm across sessions; a session finalizing in the background and the next recording share
+        transcription workers round-robin and take turns at Ollama.
+        """
+        if self.engine is not None:
+            return self.engine
+        self.engine = PipelineEngine(self.pipeline, llm_slots=llm_slots)
+        self.engine.start()  # before new_pipeline(): a failed managed server falls back to the CLI
+        self.pipeline = self.engine.new_pipeline()
+        return self.engine
+
+    def shutdown_engine(self):
+        if self.engine is not None:
+            self.engine.stop()
+            self.engine = None
+
+    def resume_session(self, session_dir):
+        """Finish the transcription/summarization jobs a killed run left in session_dir's job store."""
+        session_dir = os.path.abspath(os.path.expanduser(session_dir))
+        store_path = os.path.expanduser(self.pipeline.job_store_path or os.path.join(session_dir, 'jobs.sqlite3'))
+        if not os.path.exists(store_path):
+            print(f"No job store in {session_dir} (was it recorded with --durable-jobs?)")
+            return False
+        self.current_session_dir = session_dir
+        self.pipeline.automation_enabled = True
+        self.pipeline.durable_jobs = True
+        self.pipeline.set_session_dir(session_dir)
+        self.pipeline.resume_jobs()
+        self.pipeline.start()
+        self.pipeline.drain()
+        self.pipeline.stop()
+        self.current_session_dir = None
+        return True
+
     def print_status(self):
         """Print current recording status"""
         if self.recording:
@@ -407,6 +626,16 @@ class MeetingRecorder:
                 print(f"Session: {self.current_session_dir}")
         else:
             print("Not recording")
+        for session_dir, fin in list(self._finalizers.items()):
+            if fin["thread"].is_alive():
+                p = fin["pipeline"].progress()
+                elapsed = int(time.monotonic() - fin["started"])
+                print(f"Finalizing {session_dir} ({elapsed}s): {p['stage']}, "
+                      f"{p['transcription_pending']} to transcribe, {p['summarization_pending'] + p['held_for_order']} to summarize, "
+                      f"{p['transcribed']} transcribed, {p['summarized']} summarized")
+            else:
+                print(f"Finalized {session_dir}: {fin['state']}")
+                self._finalizers.pop(session_dir, None)
     
     def interactive_mode(self):
         """Start an interactive recording session"""
@@ -421,7 +650,7 @@ class MeetingRecorder:
                     name = input("Recording name (optional): ").strip() or None
                     self.start_recording(name)
                 elif cmd == "stop":
-                    self.stop_recording(False)
+                    self.stop_recording(False, background=True)
                 elif cmd in ("status", ""):
                     self.print_status()
                 elif cmd == "post":
@@ -440,6 +669,7 @@ class MeetingRecorder:
                 print("\nUse 'quit' to exit or 'stop' to stop recording")
             except Exception as e:
                 print(f"Error: {e}")
+        self.wait_for_finalization()
         print("Exiting...")
 
 if __name__ == "__main__":
@@ -466,15 +696,27 @@ if __name__ == "__main__":
     parser.add_argument("--name", "-n", default=cfg("name", None), help="Custom session name prefix")
     parser.add_argument("--start", action="store_true", help="Start recording immediately")
     parser.add_argument("--segment-duration", type=int, default=cfg("segment_duration", 300), help="Segment duration in seconds (default: 300)")
+    parser.add_argument("--capture-mode", choices=["segments", "stream"], default=cfg("capture_mode", "segments"), help="segments: ffmpeg writes segment WAVs (default); stream: read PCM from ffmpeg stdout and cut segments in process")
+    parser.add_argument("--segmentation", choices=["fixed", "vad"], default=cfg("segmentation", "fixed"), help="fixed: cut every --segment-duration seconds (default); vad: cut at the nearest pause (implies --capture-mode stream)")
+    parser.add_argument("--vad-window", type=float, default=cfg("vad_window", None), help="VAD: search for a pause within +/- this many seconds of --segment-duration (default: 20%% of it, max 30)")
+    parser.add_argument("--max-segment-duration", type=float, default=cfg("max_segment_duration", None), help="VAD: hard maximum segment length in seconds (default: segment duration + window; never below the segment duration)")
+    parser.add_argument("--vad-threshold", type=float, default=cfg("vad_threshold", 400.0), help="VAD: RMS level (int16 scale) below which a 30 ms frame counts as silence (default: 400)")
+    parser.add_argument("--vad-min-pause-ms", type=int, default=cfg("vad_min_pause_ms", 300), help="VAD: minimum pause length to cut at (default: 300)")
+    parser.add_argument("--skip-silence-seconds", type=float, default=cfg("skip_silence_seconds", 10.0), help="VAD: drop leading silence longer than this many seconds instead of transcribing it (default: 10, 0 disables)")
+    parser.add_argument("--segment-monitor", choices=["list", "poll"], default=cfg("segment_monitor", "list"), help="Segment completion detection: ffmpeg segment list over a pipe (default) or directory polling")
     parser.add_argument("--enable-automation", action="store_true", default=cfg("enable_automation", False), help="Enable automated transcription and summarization pipeline")
     # Whisper backend and params
-    parser.add_argument("--whisper-backend", choices=["cli", "pywhispercpp", "server"], default=cfg("whisper_backend", "cli"), help="Transcription backend: CLI (default), pywhispercpp binding, or HTTP server")
+    parser.add_argument("--whisper-backend", choices=["cli", "pywhispercpp", "server", "managed-server"], default=cfg("whisper_backend", "cli"), help="Transcription backend: CLI (default), pywhispercpp binding, HTTP server, or a whisper.cpp server started and supervised by the pipeline")
     parser.add_argument("--whisper-path", default=cfg("whisper_path", "/usr/local/bin/whisper"), help="Path to Whisper.cpp executable (default: /usr/local/bin/whisper)")
     parser.add_argument("--whisper-model", default=cfg("whisper_model", "base"), help="Whisper.cpp model path or size (tiny|base|small|medium|large)")
     parser.add_argument("--whisper-language", default=cfg("whisper_language", "auto"), help="Language code for Whisper.cpp (default: auto)")
     parser.add_argument("--whisper-threads", type=int, default=cfg("whisper_threads", 4), help="CPU threads for Whisper.cpp (default: 4)")
+    parser.add_argument("--pywhisper-processes", type=int, default=cfg("pywhisper_processes", 0), help="pywhispercpp backend: run the model in N worker processes, splitting --whisper-threads between them (default: 0, in process)")
     parser.add_argument("--whisper-server-url", default=cfg("whisper_server_url", "http://127.0.0.1:8080"), help="Whisper.cpp server URL (default: http://127.0.0.1:8080)")
+    parser.add_argument("--whisper-server-path", default=cfg("whisper_server_path", None), help="whisper.cpp server binary for --whisper-backend managed-server (default: whisper-server next to --whisper-path)")
     parser.add_argument("--whisper-server-timeout", type=int, default=cfg("whisper_server_timeout", 120), help="Whisper.cpp server timeout in seconds (default: 120)")
+    parser.add_argument("--transcript-cache-dir", default=cfg("transcript_cache_dir", "~/.cache/meeting_recorder/transcripts"), help="Content-addressed cache of whisper results, reused when the same audio is transcribed again with the same settings")
+    parser.add_argument("--transcript-cache-mb", type=float, default=cfg("transcript_cache_mb", 512), help="Size limit of the transcript cache in MB; least recently used entries are evicted (default: 512, 0 disables)")
     parser.add_argument("--pad-silence-ms", type=int, default=cfg("pad_silence_ms", 300), help="Pad this many milliseconds of trailing silence per segment before transcription (default: 300)")
     parser.add_argument("--pre-roll-ms", type=int, default=cfg("pre_roll_ms", 300), help="Prepend this many milliseconds from previous segment for transcription context (default: 300)")
     # Ollama
@@ -483,8 +725,34 @@ if __name__ == "__main__":
     parser.add_argument("--ollama-system-prompt", default=cfg("ollama_system_prompt", None), help="Ollama system prompt (persona/context)")
     parser.add_argument("--ollama-prompt-initial", default=cfg("ollama_prompt_initial", None), help="(Reserved) Custom initial summary prompt")
     parser.add_argument("--ollama-prompt-continuation", default=cfg("ollama_prompt_continuation", None), help="(Reserved) Custom continuation summary prompt")
+    parser.add_argument("--ollama-idle-timeout", type=float, default=cfg("ollama_idle_timeout", 120), help="Abandon a streamed Ollama generation after this many seconds without new tokens (default: 120)")
+    parser.add_argument("--ollama-keep-alive", default=cfg("ollama_keep_alive", "30m"), help="How long Ollama keeps the model loaded between calls (default: 30m, empty to use the server default)")
+    parser.add_argument("--ollama-context-tokens", type=int, default=cfg("ollama_context_tokens", 3072), help="Carry Ollama's returned context between summaries while it stays under this many tokens, so only new transcript is prefilled; keep below the model's num_ctx (default: 3072, 0 disables)")
+    parser.add_argument("--summary-cache-dir", default=cfg("summary_cache_dir", "~/.cache/meeting_recorder/summaries"), help="Cache of Ollama responses keyed by model, system prompt, prompt and options")
+    parser.add_argument("--summary-cache-mb", type=float, default=cfg("summary_cache_mb", 128), help="Size limit of the summary cache in MB; least recently used entries are evicted (default: 128, 0 disables)")
     parser.add_argument("--metrics-enabled", action="store_true", help="Enable metrics collection (timings, backlog) for automation pipeline")
     parser.add_argument("--metrics-dir", default=cfg("metrics_dir", "metrics"), help="Relative directory name under session root for metrics output (default: metrics)")
+    parser.add_argument("--transcription-workers", type=int, default=cfg("transcription_workers", 1), help="Number of parallel transcription workers; summaries still follow segment order (default: 1)")
+    parser.add_argument("--cli-batch-size", type=int, default=cfg("cli_batch_size", 1), help="CLI backend: pass up to N already-queued segments to one whisper-cli run so the model loads once during catch-up (default: 1)")
+    parser.add_argument("--min-speech-ratio", type=float, default=cfg("min_speech_ratio", 0), help="Skip whisper and summarization for segments with less than this fraction of voiced 30 ms frames (default: 0, off; e.g. 0.02 with a --silence-threshold suited to the input level)")
+    parser.add_argument("--silence-threshold", type=float, default=cfg("silence_threshold", 400.0), help="RMS level (int16 scale) a frame must reach to count as voiced for --min-speech-ratio (default: 400)")
+    parser.add_argument("--summary-batch-tokens", type=int, default=cfg("summary_batch_tokens", 0), help="Fill each summarization batch up to this many estimated transcript tokens (tiktoken if installed, else chars/4) instead of --summary-batch-size segments (default: 0, off)")
+    parser.add_argument("--summary-max-wait", type=float, default=cfg("summary_max_wait", 0), help="Summarize a partially filled batch once its oldest transcript has waited this many seconds (default: 0, no limit)")
+    parser.add_argument("--final-summary-max-tokens", type=int, default=cfg("final_summary_max_tokens", 3000), help="Batch summaries longer than this (estimated tokens) are merged in a tree before the final summary (default: 3000, 0 disables)")
+    parser.add_argument("--final-summary-fan-in", type=int, default=cfg("final_summary_fan_in", 4), help="Summaries merged per call at each tree level (default: 4)")
+    parser.add_argument("--final-summary-workers", type=int, default=cfg("final_summary_workers", 2), help="Concurrent Ollama merge calls per tree level (default: 2)")
+    parser.add_argument("--adaptive-degradation", action="store_true", default=cfg("adaptive_degradation", False), help="Trade quality for throughput while the pipeline is behind, stepping through --degradation-steps and back")
+    parser.add_argument("--degradation-steps", default=cfg("degradation_steps", "bigger_batches,defer_rolling,skip_pre_roll,smaller_model"), help="Comma-separated order of degradation steps (bigger_batches, defer_rolling, skip_pre_roll, smaller_model)")
+    parser.add_argument("--degrade-whisper-model", default=cfg("degrade_whisper_model", None), help="Smaller whisper model used by the smaller_model step (CLI backend)")
+    parser.add_argument("--degrade-high-backlog", type=float, default=cfg("degrade_high_backlog", 120), help="Estimated seconds of queued work above which the next degradation step is enabled (default: 120)")
+    parser.add_argument("--degrade-low-backlog", type=float, default=cfg("degrade_low_backlog", 20), help="Estimated seconds of queued work below which the last step is disabled again (default: 20)")
+    parser.add_argument("--durable-jobs", action="store_true", default=cfg("durable_jobs", False), help="Record every transcription/summarization job and the rolling summary state in <session>/jobs.sqlite3 so an interrupted session can be resumed")
+    parser.add_argument("--drain-timeout", type=float, default=cfg("drain_timeout", None), help="When stopping, wait at most this many seconds for queued transcription/summarization jobs (default: until done)")
+    parser.add_argument("--job-store", default=cfg("job_store", None), help="Shared SQLite job store (e.g. on a shared volume) used instead of <session>/jobs.sqlite3; jobs are scoped by session. Opened without WAL; the volume must support POSIX file locks (see README)")
+    parser.add_argument("--remote-transcription", action="store_true", default=cfg("remote_transcription", False), help="Only record segments in the job store and let transcription_worker.py processes transcribe them; this host captures and summarizes (implies --durable-jobs)")
+    parser.add_argument("--shared-engine", action="store_true", default=cfg("shared_engine", False), help="Keep transcription backends (managed server, models, HTTP pools) warm in one engine shared by all sessions, with fair scheduling between a session finalizing in the background and the next recording")
+    parser.add_argument("--engine-llm-slots", type=int, default=cfg("engine_llm_slots", 2), help="With --shared-engine, concurrent Ollama calls across all sessions (default: 2)")
+    parser.add_argument("--resume-session", metavar="SESSION_DIR", default=None, help="Finish the unfinished jobs of a session recorded with --durable-jobs, then exit")
     parser.add_argument("--summary-batch-size", type=int, default=cfg("summary_batch_size", 1), help="Number of transcription segments to concatenate for each summarization batch (default: 1, i.e., per-segment)")
 
     args = parser.parse_args()
@@ -510,7 +778,18 @@ if __name__ == "__main__":
         automation_enabled=args.enable_automation,
         metrics_enabled=args.metrics_enabled,
         metrics_dir_name=args.metrics_dir,
-        summary_batch_size=args.summary_batch_size
+        summary_batch_size=args.summary_batch_size,
+        transcription_workers=args.transcription_workers,
+        segment_monitor=args.segment_monitor,
+        capture_mode=args.capture_mode,
+        segmentation=args.segmentation,
+        vad_options={
+            "vad_window_s": args.vad_window,
+            "max_segment_s": args.max_segment_duration,
+            "vad_threshold_rms": args.vad_threshold,
+            "min_pause_ms": args.vad_min_pause_ms,
+            "skip_silence_s": args.skip_silence_seconds
+        }
     )
 
     recorder.pipeline.whisper_backend = args.whisper_backend
@@ -518,27 +797,63 @@ if __name__ == "__main__":
     recorder.pipeline.whisper_model = args.whisper_model
     recorder.pipeline.whisper_language = args.whisper_language
     recorder.pipeline.whisper_threads = args.whisper_threads
+    recorder.pipeline.pywhisper_processes = max(0, int(args.pywhisper_processes or 0))
     recorder.pipeline.whisper_server_url = args.whisper_server_url
     recorder.pipeline.whisper_server_timeout = args.whisper_server_timeout
+    recorder.pipeline.whisper_server_path = args.whisper_server_path
+    recorder.pipeline.transcript_cache_dir = args.transcript_cache_dir
+    recorder.pipeline.transcript_cache_max_mb = max(0.0, float(args.transcript_cache_mb or 0))
+    recorder.pipeline.cli_batch_size = max(1, int(args.cli_batch_size or 1))
     recorder.pipeline.pad_silence_ms = max(0, int(args.pad_silence_ms or 0))
     recorder.pipeline.pre_roll_ms = max(0, int(args.pre_roll_ms or 0))
+    recorder.pipeline.min_speech_ratio = max(0.0, float(args.min_speech_ratio or 0))
+    recorder.pipeline.silence_threshold_rms = float(args.silence_threshold)
     recorder.pipeline.ollama_url = args.ollama_url
     recorder.pipeline.ollama_model = args.ollama_model
+    recorder.pipeline.ollama_idle_timeout = float(args.ollama_idle_timeout)
+    recorder.pipeline.ollama_keep_alive = args.ollama_keep_alive or None
+    recorder.pipeline.ollama_context_tokens = max(0, int(args.ollama_context_tokens or 0))
+    recorder.pipeline.summary_cache_dir = args.summary_cache_dir
+    recorder.pipeline.summary_cache_max_mb = max(0.0, float(args.summary_cache_mb or 0))
     if args.ollama_system_prompt is not None:
         recorder.pipeline.system_prompt = args.ollama_system_prompt
     # Propagate summary_batch_size
     recorder.pipeline.summary_batch_size = args.summary_batch_size
+    recorder.pipeline.summary_batch_tokens = max(0, int(args.summary_batch_tokens or 0))
+    recorder.pipeline.adaptive_degradation = bool(args.adaptive_degradation)
+    recorder.pipeline.degradation_steps = [step.strip() for step in str(args.degradation_steps or "").split(",") if step.strip()]
+    recorder.pipeline.degrade_whisper_model = args.degrade_whisper_model
+    recorder.pipeline.degrade_high_backlog_s = float(args.degrade_high_backlog)
+    recorder.pipeline.degrade_low_backlog_s = float(args.degrade_low_backlog)
+    recorder.pipeline.durable_jobs = bool(args.durable_jobs or args.remote_transcription)
+    recorder.pipeline.job_store_path = args.job_store
+    recorder.pipeline.remote_transcription = bool(args.remote_transcription)
+    recorder.pipeline.final_summary_max_tokens = max(0, int(args.final_summary_max_tokens or 0))
+    recorder.pipeline.final_summary_fan_in = max(2, int(args.final_summary_fan_in or 2))
+    recorder.pipeline.final_summary_workers = max(1, int(args.final_summary_workers or 1))
+    recorder.pipeline.summary_max_wait_s = max(0.0, float(args.summary_max_wait or 0))
 
-    if args.start:
-        print("Recording started. Press Ctrl+C to stop.")
-        recorder.start_recording(args.name)
-        try:
-            while recorder.recording:
-                time.sleep(1)
-                if int(time.time()) % 10 == 0:
-                    recorder.print_status()
-        except KeyboardInterrupt:
-            print("\nStopping recording...")
-            recorder.stop_recording(False)
-    else:
-        recorder.interactive_mode()
+    recorder.drain_timeout = args.drain_timeout if args.drain_timeout and args.drain_timeout > 0 else None
+
+    if args.resume_session:
+        sys.exit(0 if recorder.resume_session(args.resume_session) else 1)
+
+    if args.shared_engine and args.enable_automation:
+        recorder.enable_shared_engine(llm_slots=max(1, int(args.engine_llm_slots or 1)))
+
+    try:
+        if args.start:
+            print("Recording started. Press Ctrl+C to stop.")
+            recorder.start_recording(args.name)
+            try:
+                while recorder.recording:
+                    time.sleep(1)
+                    if int(time.time()) % 10 == 0:
+                        recorder.print_status()
+            except KeyboardInterrupt:
+                print("\nStopping recording...")
+                recorder.stop_recording(False)
+        else:
+            recorder.interactive_mode()
+    finally:
+        recorder.shutdown_engine()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class PipelineEngine:
+    """Warm backends and fair scheduling shared by several session pipelines.
+
+    `backend` is a ProcessingPipeline that never gets a session: it carries the configuration and
+    owns what is expensive to set up (managed whisper server, pywhispercpp pool or per-thread models,
+    pooled HTTP sessions, caches). Session pipelines created by new_pipeline() keep their own state
+    (session dir, rolling summary, batch summaries, metrics file, job store, Ollama context) and
+    submit transcription work here instead of running their own workers.
+
+    Transcription jobs are taken round-robin across sessions, one batch per turn, so a long
+    meeting with a backlog cannot starve a new one. Ollama calls go through llm_slot(): at most
+    `llm_slots` run at once, and a free slot goes to the waiting session that was served least
+    recently.
+    """
+    def __init__(self, backend, workers=None, llm_slots=2):
+        self.backend = backend
+        self.num_workers = max(1, int(workers or backend.transcription_workers or 1))
+        if (backend.whisper_backend or "cli").lower() == "pywhispercpp" and backend.pywhisper_processes > 0:
+            self.num_workers = max(self.num_workers, int(backend.pywhisper_processes))
+        self.llm_slots = max(1, int(llm_slots or 1))
+        self.workers = []
+        self.running = False
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session pipeline -> deque of transcription items, in rotation order
+        self._llm_cond = threading.Condition()
+        self._llm_active = 0
+        self._llm_waiting = []  # pipelines waiting for a slot, in arrival order
+        self._llm_last_served = {}  # pipeline id -> monotonic time of its last grant
+
+    def new_pipeline(self):
+        """A session pipeline with the backend's configuration, scheduled on this engine."""
+        pipeline = self.backend.new_session_pipeline()
+        pipeline.engine = self
+        return pipeline
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        if (self.backend.whisper_backend or "cli").lower() == "managed-server" and not self.backend.remote_transcription:
+            self.backend._start_managed_server()
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"engine-tx-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for t in self.workers:
+            t.start()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        for t in self.workers:
+            t.join(timeout=5)
+        self.workers = []
+        self.backend.stop()  # closes HTTP sessions, managed server and pywhispercpp pool
+
+    def attach(self, pipeline):
+        with self._cond:
+            self._queues.setdefault(pipeline, deque())
+
+    def detach(self, pipeline):
+        """Remove a session (it has drained or is stopping); returns its items that were still queued."""
+        with self._cond:
+            items = self._queues.pop(pipeline, None)
+        with self._llm_cond:
+            self._llm_last_served.pop(id(pipeline), None)
+        return list(items or ())
+
+    def submit(self, pipeline, item):
+        with self._cond:
+            self._queues.setdefault(pipeline, deque()).append(item)
+            self._cond.notify()
+
+    def queued(self, pipeline):
+        with self._cond:
+            return len(self._queues.get(pipeline) or ())
+
+    def _next_batch_locked(self):
+        """Pop a batch from the first session (in rotation) with work, then move it to the back."""
+        for pipeline, items in self._queues.items():
+            if not items:
+                continue
+            limit = 1
+            if pipeline.cli_batch_size > 1 and pipeline._whisper_backend() == "cli":
+                limit = pipeline.cli_batch_size
+            batch = [items.popleft() for _ in range(min(limit, len(items)))]
+            self._queues.move_to_end(pipeline)
+            return pipeline, batch
+        return None, None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                pipeline, batch = self._next_batch_locked()
+                while batch is None and self.running:
+                    self._cond.wait()
+                    pipeline, batch = self._next_batch_locked()
+                if batch is None:
+                    return
+            pipeline._run_engine_batch(batch)
+
+    @contextmanager
+    def llm_slot(self, pipeline):
+        """Hold one of the llm_slots for an Ollama call, granted fairly across sessions."""
+        key = id(pipeline)
+        with self._llm_cond:
+            self._llm_waiting.append(key)
+            while not (self._llm_active < self.llm_slots and self._llm_next_locked() == key):
+                self._llm_cond.wait()
+            self._llm_waiting.remove(key)
+            self._llm_active += 1
+            self._llm_last_served[key] = time.monotonic()
+            self._llm_cond.notify_all()  # another slot may be free for the next waiter
+        try:
+            yield
+        finally:
+            with self._llm_cond:
+                self._llm_active -= 1
+                self._llm_cond.notify_all()
+
+    def _llm_next_locked(self):
+        # Least recently served session first; arrival order breaks ties (stable min)
+        return min(self._llm_waiting, key=lambda k: self._llm_last_served.get(k, 0.0))
@@ -5,42 +5,112 @@ import subprocess
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import wave
 from datetime import datetime, timezone
 from typing import Optional
 import importlib
+import importlib.util
+import io
+import itertools
+import hashlib
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from whisper_server import WhisperServerManager, find_server_binary
+from result_cache import ResultCache
+from job_store import JobStore
+from pywhisper_pool import PywhisperPool, compact_segments
+from rec_utils import WHISPER_SAMPLE_RATE, WHISPER_SAMPLE_WIDTH, get_wav_duration, read_wav_header, is_whisper_pcm_wav, read_wav_frames, iter_wav_frames, write_wav_pcm, speech_activity, update_recording_metadata
 
 class ProcessingPipeline:
     """Orchestrates the automated workflow with decoupled stages:
        segments → [Transcription Queue] → transcripts → [Summarization Queue] → summaries
     """
+    # Public attributes that hold a session's runtime state rather than configuration
+    SESSION_STATE_ATTRS = frozenset({
+        "running", "transcribe_queue", "summarize_queue", "tx_threads", "sum_thread", "session_dir",
+        "job_store", "metrics_file_path", "rolling_summary_text", "last_summary", "degradation_level", "drain_stage"
+    })
+    # Put on summarize_queue by drain(): summarize the partial batch now instead of waiting for more transcripts
+    _FLUSH_BATCH = object()
+
     def __init__(self, automation_enabled=True, whisper_path="/usr/local/bin/whisper", whisper_model="base", whisper_language="auto", whisper_threads=4,
-                 ollama_url="http://localhost:11434", ollama_model="llama2", system_prompt=None, summary_batch_size=1):
+                 ollama_url="http://localhost:11434", ollama_model="llama2", system_prompt=None, summary_batch_size=1,
+                 transcription_workers=1):
         self.automation_enabled = automation_enabled
         # Independent queues
         self.transcribe_queue = queue.Queue()
         self.summarize_queue = queue.Queue()
         # Worker threads & state
-        self.tx_thread = None
+        self.tx_threads = []
         self.sum_thread = None
         self.running = False
-        self._tx_busy = False
-        self._sum_busy = False
+        # Job accounting: an item is counted from enqueue until its stage is done with it (a
+        # transcript is counted for summarization before its transcription is released), and every
+        # change notifies _work_cond, so drain() waits for the last job instead of polling
+        self._work_cond = threading.Condition()
+        self._tx_pending = 0  # local transcriptions queued or in progress
+        self._sum_pending = 0  # summarization items queued, held in a partial batch or in progress
+        self._stop_token = None  # queue sentinel of the current run, see start()/stop()
+        self._stopped = threading.Event()
+        self.drain_stage = None  # progress of drain(): waiting, final_transcript, final_summary, done, timeout
+        # Shared PipelineEngine (pipeline_engine.py): when set, transcription runs on the engine's
+        # workers and the warm backends (server, models, HTTP pools, caches) are the engine's
+        self.engine = None
+        # Transcription worker pool size (each worker owns its backend client)
+        self.transcription_workers = max(1, int(transcription_workers or 1))
+        # CLI backend: max queued segments passed to a single whisper-cli invocation
+        self.cli_batch_size = 1
+        self._worker_local = threading.local()
+        # Reorder buffer: transcripts finish out of order, summarization consumes them in segment_index order
+        self._reorder_lock = threading.Lock()
+        self._reorder_buffer = {}
+        self._skipped_indices = set()
+        self._next_sum_index = 0
         # Config
         self.whisper_path = whisper_path
         self.whisper_model = whisper_model
         self.whisper_language = whisper_language
         self.whisper_threads = whisper_threads
-        # New: backend selection ("cli", "pywhispercpp", or "server")
+        # New: backend selection ("cli", "pywhispercpp", "server", or "managed-server")
         self.whisper_backend = "cli"
-        # Cached pywhispercpp model instance
-        self._pyw_model = None
         # Server backend configuration
         self.whisper_server_url = "http://127.0.0.1:8080"
         self.whisper_server_timeout = 120  # seconds
+        # Managed server backend: whisper.cpp server spawned and supervised by the pipeline
+        self.whisper_server_path = None  # default: whisper-server next to whisper_path
+        self._whisper_server = None
+        # pywhispercpp backend: > 0 runs the model in this many worker processes (whisper_threads
+        # split between them) instead of one model per transcription thread in this interpreter
+        self.pywhisper_processes = 0
+        self._pywhisper_pool = None
+        self._pywhisper_pool_lock = threading.Lock()
+        # Content-addressed transcript cache (disabled when dir is None or max is 0)
+        self.transcript_cache_dir = None
+        self.transcript_cache_max_mb = 512
+        self._transcript_cache = None
+        self._transcript_cache_lock = threading.Lock()
+        # Ollama response cache keyed on (model, system prompt, prompt, options); same semantics
+        self.summary_cache_dir = None
+        self.summary_cache_max_mb = 128
+        self._summary_cache = None
+        self._summary_cache_lock = threading.Lock()
+        # Pooled keep-alive HTTP sessions per backend ("whisper", "ollama"), closed in stop()
+        self._http_sessions = {}
+        self._http_lock = threading.Lock()
+        self.http_retries = 3
         self.ollama_url = ollama_url
         self.ollama_model = ollama_model
+        # KV reuse: keep the model loaded and continue from the previous call's returned context
+        # while it stays under ollama_context_tokens (0 disables reuse)
+        self.ollama_keep_alive = "30m"
+        self.ollama_context_tokens = 3072  # fits Ollama's default 4096-token num_ctx
+        self._ollama_context = None
+        self.ollama_idle_timeout = 120  # seconds without streamed data before a generation is abandoned
         self.system_prompt = system_prompt or ""
         self.rolling_summary_text = None  # maintains cumulative rolling summary
         self.last_summary = None  # For rolling summary
@@ -50,44 +120,342 @@ class ProcessingPipeline:
         self.metrics_file_path = None
         self._processed_tx = 0
         self._processed_sum = 0
-        self._ema_latency = None
+        self._ema_latency = {}  # stage -> EMA of per-item processing seconds
         self._ema_alpha = 0.2
+        # Adaptive degradation: when the queued work (queue depth x latency EMA) exceeds
+        # degrade_high_backlog_s, the next step in degradation_steps is enabled; below
+        # degrade_low_backlog_s the last one is disabled again (at most one change per cooldown)
+        self.adaptive_degradation = False
+        self.degradation_steps = ["bigger_batches", "defer_rolling", "skip_pre_roll", "smaller_model"]
+        self.degradation_level = 0
+        self.degrade_high_backlog_s = 120.0
+        self.degrade_low_backlog_s = 20.0
+        self.degrade_cooldown_s = 30.0
+        self.degrade_whisper_model = None  # CLI model used by "smaller_model"
+        self.degrade_batch_factor = 2
+        self._degrade_lock = threading.Lock()
+        self._degrade_changed_at = 0.0
+        self._deferred_summaries = []  # segment summaries not yet folded into the rolling summary
         self.session_dir = None
+        # Durable job record (SQLite WAL at <session>/jobs.sqlite3) so an interrupted session can be resumed
+        self.durable_jobs = False
+        self.job_store = None
+        # Shared job store (e.g. on a shared volume) used instead of <session>/jobs.sqlite3; jobs are
+        # scoped by session dir. With remote_transcription, segments are only recorded there and
+        # transcribed by transcription_worker.py processes; this pipeline collects their results.
+        self.job_store_path = None
+        self.remote_transcription = False
+        self.remote_poll_interval = 1.0
+        self._remote_outstanding = 0
         # Optional: pad silence at the end of each segment before transcription (ms)
         self.pad_silence_ms = 300
         # New: add small pre-roll from previous segment to improve boundary recognition (ms)
         self.pre_roll_ms = 300
+        # Silent-segment skip: segments whose fraction of 30 ms frames at/above silence_threshold_rms
+        # is below min_speech_ratio bypass whisper and summarization (0 disables the check)
+        self.min_speech_ratio = 0.0
+        self.silence_threshold_rms = 400.0
         # New: batch size for summarization
         self.summary_batch_size = summary_batch_size
+        # Token-budget batching: when > 0, batches are filled up to this many transcript tokens
+        # instead of summary_batch_size segments; a partial batch is flushed after summary_max_wait_s
+        self.summary_batch_tokens = 0
+        self.summary_max_wait_s = 0
+        self.tokenizer_encoding = "cl100k_base"
+        self._tokenizer = None  # tiktoken encoding, False when unavailable
+        # Final summary tree reduction: batch summaries beyond final_summary_max_tokens are merged in
+        # groups of final_summary_fan_in (final_summary_workers groups at a time), level by level
+        self.final_summary_max_tokens = 3000
+        self.final_summary_fan_in = 4
+        self.final_summary_workers = 2
+        self._merge_memo = {}  # tuple(group) -> merged summary
+        self._merge_lock = threading.Lock()
+        self._prefetch_thread = None  # background merges for the final summary (_prefetch_summary_tree)
+        self._prefetch_pending = None  # newest batch summaries waiting for that thread
         self._batch_summaries = []
 
+    def new_session_pipeline(self):
+        """A pipeline with this one's configuration and fresh session state (queues, workers, summaries),
+        so a new session can start while this one is still being finalized."""
+        fresh = ProcessingPipeline()
+        for name, value in vars(self).items():
+            if name.startswith('_') or name in self.SESSION_STATE_ATTRS:
+                continue
+            setattr(fresh, name, list(value) if isinstance(value, list) else value)
+        return fresh
+
+    def progress(self):
+        """Snapshot of outstanding and finished work, e.g. for a status display."""
+        with self._work_cond:
+            return {
+                "stage": self.drain_stage or ("running" if self.running else "idle"),
+                "transcription_pending": self._tx_pending + self._remote_outstanding,
+                "summarization_pending": self._sum_pending,
+                "held_for_order": len(self._reorder_buffer),
+                "transcribed": self._processed_tx,
+                "summarized": self._processed_sum,
+                "batch_summaries": len(self._batch_summaries)
+            }
+
     def set_session_dir(self, session_dir):
         self.session_dir = session_dir
+        self.drain_stage = None
+        self._ollama_context = None
+        self._deferred_summaries = []
+        self.degradation_level = 0
+        with self._merge_lock:
+            self._merge_memo = {}
+        with self._reorder_lock:
+            self._reorder_buffer = {}
+            self._skipped_indices = set()
+            self._next_sum_index = 0
+        self._batch_summaries = []
+        if self.job_store:
+            self.job_store.close()
+            self.job_store = None
+        if (self.durable_jobs or self.remote_transcription) and self.session_dir:
+            if self.job_store_path:
+                self.job_store = JobStore(os.path.expanduser(self.job_store_path), session=os.path.abspath(self.session_dir),
+                                          shared=True)
+            else:
+                self.job_store = JobStore(os.path.join(self.session_dir, 'jobs.sqlite3'))
+        self._set_remote_outstanding(0)
         if self.metrics_enabled and self.session_dir:
             metrics_dir = os.path.join(self.session_dir, self.metrics_dir_name)
             os.makedirs(metrics_dir, exist_ok=True)
             self.metrics_file_path = os.path.join(metrics_dir, 'metrics.ndjson')
 
+    def resume_jobs(self):
+        """Re-queue work a killed run left unfinished in this session's job store.
+
+        Restores the rolling summary state, re-queues interrupted transcriptions, and feeds
+        interrupted summarizations back in segment order. Returns (transcriptions, summarizations).
+        With remote_transcription, transcription jobs stay in the store for the workers to (re)claim.
+        """
+        store = self.job_store
+        if store is None:
+            return 0, 0
+        state = store.get_state("summary_state") or {}
+        if state.get("rolling_summary_text"):
+            self.rolling_summary_text = state["rolling_summary_text"]
+        self._batch_summaries = list(state.get("batch_summaries") or [])
+        self._deferred_summaries = list(state.get("deferred_summaries") or [])
+        tx_jobs = store.unfinished("transcription")
+        sum_jobs = store.unfinished("summarization")
+        waiting = {j["segment_index"] for j in tx_jobs + sum_jobs if j["segment_index"] is not None}
+        if self._remote_enabled():
+            # Finished remotely but not yet handed to summarization
+            waiting |= store.indices("transcription", uncollected=True)
+            self._set_remote_outstanding(store.outstanding("transcription"))
+        known = store.indices("transcription")
+        with self._reorder_lock:
+            self._next_sum_index = min(waiting) if waiting else (max(known) + 1 if known else 0)
+            # Everything else at or after that point is settled (summarized, silent or failed)
+            self._skipped_indices = {i for i in known - waiting if i >= self._next_sum_index}
+        for job in sum_jobs:
+            md = dict(job["payload"].get("metadata") or {})
+            md['sum_job_id'] = job["id"]
+            self._handoff_transcript(job["segment_path"], job["payload"].get("transcript", ""), md)
+        for job in tx_jobs:
+            if self._remote_enabled():
+                continue  # still claimable; a dead worker's lease expires and another takes it
+            md = dict(job["payload"].get("metadata") or {})
+            md['tx_job_id'] = job["id"]
+            self.enqueue_transcription(job["segment_path"], md)
+        if tx_jobs or sum_jobs:
+            print(f"[Pipeline] Resuming session {self.session_dir}: {len(tx_jobs)} transcription and {len(sum_jobs)} summarization jobs unfinished")
+        return len(tx_jobs), len(sum_jobs)
+
+    def _persist_summary_state(self):
+        if self.job_store:
+            self.job_store.set_state("summary_state", {
+                "rolling_summary_text": self.rolling_summary_text,
+                "batch_summaries": self._batch_summaries,
+                "deferred_summaries": self._deferred_summaries
+            })
+
+    def _job_update(self, action, job_id, *args):
+        """Record a job transition; the durable record must never take a worker down."""
+        if self.job_store is None or job_id is None:
+            return
+        try:
+            getattr(self.job_store, action)(job_id, *args)
+        except Exception as e:
+            print(f"[Pipeline][WARN] Job store {action} failed for job {job_id}: {e}")
+
+    def _remote_enabled(self):
+        return self.remote_transcription and self.job_store is not None
+
+    def _add_pending(self, counter, delta):
+        with self._work_cond:
+            setattr(self, counter, getattr(self, counter) + delta)
+            self._work_cond.notify_all()
+
+    def _set_remote_outstanding(self, n):
+        with self._work_cond:
+            self._remote_outstanding = max(0, n)
+            self._work_cond.notify_all()
+
+    def _backends(self):
+        """Owner of the warm backends: the shared engine's backend pipeline, or this pipeline."""
+        return self.engine.backend if self.engine is not None else self
+
+    def _whisper_backend(self):
+        """Transcription backend in effect; read from the backends' owner so a fallback to the CLI
+        (server or pywhispercpp unavailable) applies to every session of a shared engine."""
+        return (self._backends().whisper_backend or "cli").lower()
+
     def start(self):
         if not self.automation_enabled or self.running:
             return
         self.running = True
-        self.tx_thread = threading.Thread(target=self._tx_worker, daemon=True)
-        self.sum_thread = threading.Thread(target=self._sum_worker, daemon=True)
-        self.tx_thread.start()
+        self._stopped.clear()
+        # Workers block on get() and exit when they dequeue this run's token; a token left over
+        # from an earlier run (worker outlived stop()'s join) is a different object and ignored
+        self._stop_token = object()
+        if self._remote_enabled():
+            # Transcription happens in worker processes; only collect their results here
+            self.tx_threads = [threading.Thread(target=self._remote_collector, name="tx-collector", daemon=True)]
+        elif self.engine is not None:
+            # Transcription runs on the engine's workers, scheduled fairly with other sessions
+            self.tx_threads = []
+            self.engine.attach(self)
+            self.engine.start()
+        else:
+            n_workers = max(1, int(self.transcription_workers or 1))
+            if (self.whisper_backend or "cli").lower() == "pywhispercpp" and self.pywhisper_processes > 0:
+                # One submitting thread per worker process keeps every process busy
+                n_workers = max(n_workers, int(self.pywhisper_processes))
+            self.tx_threads = [
+                threading.Thread(target=self._tx_worker, args=(self._stop_token,), name=f"tx-worker-{i}", daemon=True)
+                for i in range(n_workers)
+            ]
+        if (self.whisper_backend or "cli").lower() == "managed-server" and not self._remote_enabled() and self.engine is None:
+            self._start_managed_server()
+        self.sum_thread = threading.Thread(target=self._sum_worker, args=(self._stop_token,), daemon=True)
+        for t in self.tx_threads:
+            t.start()
         self.sum_thread.start()
 
     def stop(self):
         self.running = False
-        if self.tx_thread:
-            self.tx_thread.join(timeout=5)
+        self._stopped.set()
+        token = self._stop_token
+        if token is not None:
+            # Queued work is finished first: the tokens go behind it (FIFO)
+            for _ in self.tx_threads:
+                self.transcribe_queue.put(token)
+        for t in self.tx_threads:
+            t.join(timeout=5)
+        if self.engine is not None:
+            # Same grace period as the worker joins for this session's work still on the engine
+            with self._work_cond:
+                self._work_cond.wait_for(lambda: self._tx_pending == 0, timeout=5)
+            dropped = self.engine.detach(self)
+            if dropped:
+                print(f"[Pipeline][WARN] {len(dropped)} queued transcriptions dropped at stop")
+            self._abandon_transcriptions(dropped, "dropped at stop")
+            self._add_pending("_tx_pending", -len(dropped))
         if self.sum_thread:
+            if token is not None:
+                self.summarize_queue.put(token)
             self.sum_thread.join(timeout=5)
+        if self.job_store:
+            self.job_store.close()
+            self.job_store = None
+        if self.engine is not None:
+            return  # the backends belong to the engine
+        self._close_http_sessions()
+        if self._whisper_server:
+            self._whisper_server.stop()
+            self._whisper_server = None
+        with self._pywhisper_pool_lock:
+            pool, self._pywhisper_pool = self._pywhisper_pool, None
+        if pool:
+            pool.close()
+
+    def _start_managed_server(self):
+        """Launch a local whisper.cpp server with the configured model; fall back to the CLI if that fails."""
+        server_path = self.whisper_server_path or find_server_binary(self.whisper_path)
+        if not server_path:
+            print(f"[Pipeline][WARN] No whisper.cpp server binary found next to {self.whisper_path}; falling back to CLI backend.")
+            self.whisper_backend = "cli"
+            return
+        log_path = os.path.join(self.session_dir, 'transcription', 'whisper_server.log') if self.session_dir else None
+        manager = WhisperServerManager(server_path, self.whisper_model, threads=self.whisper_threads,
+                                       language=self.whisper_language, log_path=log_path)
+        if not manager.start():
+            print("[Pipeline][WARN] Managed whisper.cpp server unavailable; falling back to CLI backend.")
+            manager.stop()
+            self.whisper_backend = "cli"
+            return
+        self._whisper_server = manager
+
+    def _managed_server_url(self):
+        """URL of the managed server, restarting it if it crashed; None if it cannot be brought back."""
+        if self._whisper_server and self._whisper_server.ensure_running():
+            return self._whisper_server.url
+        return None
+
+    def _http_session(self, name):
+        """Pipeline-owned requests.Session for a backend, created on first use.
+        Connections are kept alive and pooled (one slot per transcription worker); connection
+        failures and 502/503/504 responses are retried with backoff."""
+        with self._http_lock:
+            session = self._http_sessions.get(name)
+            if session is None:
+                retry = Retry(
+                    total=self.http_retries,
+                    connect=self.http_retries,
+                    read=0,
+                    status=self.http_retries,
+                    backoff_factor=0.5,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    raise_on_status=False
+                )
+                pool_size = max(4, int(self.transcription_workers or 1))
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._http_sessions[name] = session
+            return session
+
+    def _close_http_sessions(self):
+        with self._http_lock:
+            sessions = list(self._http_sessions.values())
+            self._http_sessions = {}
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
 
-    def enqueue_transcription(self, segment_path, metadata):
+    def enqueue_transcription(self, segment_path, metadata, audio=None):
+        """Queue a segment for transcription. `audio` optionally carries the segment in memory
+        ({'pcm': bytes, 'pre_roll': bytes}, 16 kHz mono s16le) so the WAV on disk is not needed."""
         md = dict(metadata)
         md['tx_enqueue_monotonic'] = time.monotonic()
-        self.transcribe_queue.put((segment_path, md))
+        remote = self._remote_enabled()
+        if self.job_store and md.get('tx_job_id') is None:
+            # Durable record first: a segment accepted here is transcribed even if the process dies
+            try:
+                md['tx_job_id'] = self.job_store.enqueue("transcription", segment_path, self._segment_index_int(md.get('segment_index')),
+                                                         {"metadata": {k: v for k, v in md.items() if not k.endswith('_monotonic')}},
+                                                         remote=remote)
+            except Exception as e:
+                print(f"[Pipeline][WARN] Could not record transcription job for {segment_path}: {e}")
+                remote = False
+        if remote:
+            # A worker claims it from the store and reads the WAV from the shared session dir
+            self._add_pending("_remote_outstanding", 1)
+            return
+        self._add_pending("_tx_pending", 1)
+        if self.engine is not None:
+            self.engine.submit(self, (segment_path, md, audio))
+            return
+        self.transcribe_queue.put((segment_path, md, audio))
 
     def enqueue_summarization(self, segment_path, transcript_text, metadata):
         md = dict(metadata)
@@ -97,88 +465,402 @@ class ProcessingPipeline:
             'transcript': transcript_text,
             'metadata': md
         }
+        self._add_pending("_sum_pending", 1)
         self.summarize_queue.put(payload)
 
-    def enqueue_segment(self, segment_path, metadata):
+    def enqueue_segment(self, segment_path, metadata, audio=None):
         """Backward-compatible alias: enqueue a segment for transcription stage."""
-        return self.enqueue_transcription(segment_path, metadata)
+        return self.enqueue_transcription(segment_path, metadata, audio=audio)
 
-    def _tx_worker(self):
-        while self.running:
-            try:
-                segment_path, metadata = self.transcribe_queue.get(timeout=1)
-            except queue.Empty:
-                continue
-            self._tx_busy = True
+    def mark_segment_skipped(self, segment_index):
+        """Tell the reorder buffer a segment index will never produce a transcript."""
+        idx = self._segment_index_int(segment_index)
+        if idx is None:
+            return
+        with self._reorder_lock:
+            self._skipped_indices.add(idx)
+            self._release_ordered_locked()
+
+    def _segment_index_int(self, segment_index):
+        idx_str = str(segment_index if segment_index is not None else '').strip()
+        return int(idx_str) if idx_str.isdigit() else None
+
+    def _handoff_transcript(self, segment_path, transcript, metadata):
+        """Pass a finished transcript to summarization, holding it back until all earlier segments are done."""
+        if self.job_store and metadata.get('sum_job_id') is None:
+            metadata = dict(metadata)
             try:
-                start = time.monotonic()
-                wait_s = start - metadata.get('tx_enqueue_monotonic', start)
-                transcript = self.transcribe(segment_path, metadata)
-                proc_s = time.monotonic() - start
-                if self.metrics_enabled:
-                    chars = len(transcript) if transcript else 0
-                    tokens = chars // 4
-                    self._write_metrics_line({
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "stage": "transcription",
-                        "segment_index": metadata.get('segment_index'),
-                        "wait_s": round(wait_s, 4),
-                        "process_s": round(proc_s, 4),
-                        "queues": {
-                            "transcribe": self.transcribe_queue.qsize(),
-                            "summarize": self.summarize_queue.qsize()
-                        },
-                        "chars_transcript": chars,
-                        "tokens_transcript": tokens
-                    })
-                # handoff to summarization queue (non-blocking)
+                metadata['sum_job_id'] = self.job_store.enqueue(
+                    "summarization", segment_path, self._segment_index_int(metadata.get('segment_index')),
+                    {"transcript": transcript, "metadata": {k: v for k, v in metadata.items() if not k.endswith('_monotonic') and not k.endswith('_job_id')}})
+            except Exception as e:
+                print(f"[Pipeline][WARN] Could not record summarization job for {segment_path}: {e}")
+        idx = self._segment_index_int(metadata.get('segment_index'))
+        with self._reorder_lock:
+            if idx is None or idx < self._next_sum_index:
                 self.enqueue_summarization(segment_path, transcript, metadata)
-                self._processed_tx += 1
+                return
+            self._reorder_buffer[idx] = (segment_path, transcript, metadata)
+            self._release_ordered_locked()
+
+    def _release_ordered_locked(self):
+        while True:
+            nxt = self._next_sum_index
+            if nxt in self._reorder_buffer:
+                self.enqueue_summarization(*self._reorder_buffer.pop(nxt))
+            elif nxt in self._skipped_indices:
+                self._skipped_indices.discard(nxt)
+            else:
+                break
+            self._next_sum_index = nxt + 1
+
+    def _flush_reorder_buffer(self):
+        """Release everything still held (gaps can no longer be filled once transcription is idle)."""
+        with self._reorder_lock:
+            for idx in sorted(self._reorder_buffer):
+                self.enqueue_summarization(*self._reorder_buffer.pop(idx))
+                self._next_sum_index = idx + 1
+            self._skipped_indices = {i for i in self._skipped_indices if i >= self._next_sum_index}
+
+    def _tx_worker(self, stop_token):
+        while True:
+            item = self.transcribe_queue.get()
+            if item is stop_token:
+                break
+            if not isinstance(item, tuple):
+                continue  # stale token of an earlier run
+            batch = [item]
+            if self.cli_batch_size > 1 and self._whisper_backend() == "cli":
+                # Backlog catch-up: take what is already waiting so whisper-cli loads the model once
+                while len(batch) < self.cli_batch_size:
+                    try:
+                        item = self.transcribe_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if not isinstance(item, tuple):
+                        self.transcribe_queue.put(item)  # leave stop tokens for their worker
+                        break
+                    batch.append(item)
+            try:
+                self._process_transcription_batch(batch)
             except Exception as e:
                 print(f"[Pipeline][ERROR] Transcription worker exception: {e}")
+                self._abandon_transcriptions(batch, e)
             finally:
-                self._tx_busy = False
+                self._add_pending("_tx_pending", -len(batch))
+
+    def _run_engine_batch(self, batch):
+        """Run a batch of this session's transcriptions on a shared engine worker."""
+        try:
+            self._process_transcription_batch(batch)
+        except Exception as e:
+            print(f"[Pipeline][ERROR] Transcription worker exception: {e}")
+            self._abandon_transcriptions(batch, e)
+        finally:
+            self._add_pending("_tx_pending", -len(batch))
+
+    def _abandon_transcriptions(self, items, error):
+        """Fail the durable jobs of transcription items that will not run and skip their segments."""
+        for _segment_path, md, _audio in items:
+            self._job_update("fail", md.get('tx_job_id'), error)
+            self.mark_segment_skipped(md.get('segment_index'))
+
+    def _queued_transcriptions(self):
+        return self.engine.queued(self) if self.engine is not None else self.transcribe_queue.qsize()
+
+    def _process_transcription_batch(self, batch):
+        start = time.monotonic()
+        pending = []
+        for segment_path, metadata, audio in batch:
+            wait_s = start - metadata.get('tx_enqueue_monotonic', start)
+            self._job_update("start", metadata.get('tx_job_id'), threading.current_thread().name)
+            if self._skip_if_silent(segment_path, metadata, audio, wait_s):
+                self._job_update("finish", metadata.get('tx_job_id'), "silent")
+            else:
+                pending.append((segment_path, metadata, audio, wait_s))
+        if not pending:
+            return
+        try:
+            transcripts = self.transcribe_batch_cli([(p, md, a) for p, md, a, _w in pending])
+        except Exception as e:
+            print(f"[Pipeline][ERROR] Transcription worker exception: {e}")
+            for _p, metadata, _a, _w in pending:
+                self._job_update("fail", metadata.get('tx_job_id'), e)
+                self.mark_segment_skipped(metadata.get('segment_index'))
+            return
+        # A batch shares one whisper run; attribute an equal share of it to each segment
+        proc_s = (time.monotonic() - start) / len(pending)
+        self._record_stage_latency("transcription", proc_s)
+        for (segment_path, metadata, _audio, wait_s), transcript in zip(pending, transcripts):
+            if self.metrics_enabled:
+                chars = len(transcript) if transcript else 0
+                tokens = chars // 4
+                self._write_metrics_line({
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "stage": "transcription",
+                    "segment_index": metadata.get('segment_index'),
+                    "wait_s": round(wait_s, 4),
+                    "process_s": round(proc_s, 4),
+                    "batch_size": len(pending),
+                    "queues": {
+                        "transcribe": self._queued_transcriptions(),
+                        "summarize": self.summarize_queue.qsize()
+                    },
+                    "chars_transcript": chars,
+                    "tokens_transcript": tokens
+                })
+            # handoff to summarization queue (non-blocking, in segment order)
+            self._handoff_transcript(segment_path, transcript, metadata)
+            self._job_update("finish", metadata.get('tx_job_id'))
+            self._processed_tx += 1
+
+    def _remote_collector(self):
+        """Hand transcripts finished by remote workers to summarization (in segment order)."""
+        while not self._stopped.is_set():
+            try:
+                jobs = self.job_store.uncollected("transcription")
+                outstanding = self.job_store.outstanding("transcription")
+            except Exception as e:
+                print(f"[Pipeline][WARN] Could not read remote transcription results: {e}")
+                jobs, outstanding = [], self._remote_outstanding
+            for job in jobs:
+                self._collect_remote_transcription(job)
+                outstanding -= 1
+            self._set_remote_outstanding(outstanding)
+            if not jobs:
+                # The store is shared with other processes, so it has to be polled
+                self._stopped.wait(self.remote_poll_interval)
+
+    def _collect_remote_transcription(self, job):
+        metadata = dict(job["payload"].get("metadata") or {})
+        metadata['tx_job_id'] = job["id"]
+        result = job.get("result") if isinstance(job.get("result"), dict) else {}
+        if job["status"] == JobStore.DONE and "transcript" in result:
+            transcript = result["transcript"]
+            proc_s = (job.get("finished_at") or 0) - (job.get("started_at") or 0)
+            self._record_stage_latency("transcription", proc_s)
+            if self.metrics_enabled:
+                chars = len(transcript) if transcript else 0
+                self._write_metrics_line({
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "stage": "transcription",
+                    "segment_index": metadata.get('segment_index'),
+                    "wait_s": round((job.get("started_at") or 0) - (job.get("enqueued_at") or 0), 4),
+                    "process_s": round(proc_s, 4),
+                    "worker": job.get("worker"),
+                    "attempts": job.get("attempts"),
+                    "queues": {
+                        "transcribe": self._remote_outstanding,
+                        "summarize": self.summarize_queue.qsize()
+                    },
+                    "chars_transcript": chars,
+                    "tokens_transcript": chars // 4
+                })
+            self._handoff_transcript(job["segment_path"], transcript, metadata)
+            self._processed_tx += 1
+        else:
+            if job["status"] == JobStore.FAILED:
+                print(f"[Pipeline][ERROR] Remote transcription of {job['segment_path']} failed: {job.get('error')}")
+            self.mark_segment_skipped(metadata.get('segment_index'))
+        self._job_update("mark_collected", job["id"])
 
-    def _sum_worker(self):
+    def _skip_if_silent(self, segment_path, metadata, audio, wait_s):
+        """Pre-whisper speech-activity check; returns True if the segment was skipped."""
+        if not self.min_speech_ratio:
+            return False
+        try:
+            if audio is not None:
+                pcm = audio['pcm']
+            elif is_whisper_pcm_wav(segment_path):
+                pcm = read_wav_frames(segment_path)
+            else:
+                return False
+            activity = speech_activity(pcm, self.silence_threshold_rms)
+        except Exception as e:
+            print(f"[Pipeline][WARN] Speech-activity check failed for {segment_path}: {e}")
+            return False
+        if activity >= self.min_speech_ratio:
+            return False
+        print(f"[Pipeline] Skipping silent segment {segment_path} (speech activity {activity:.1%})")
+        update_recording_metadata(segment_path, {
+            "transcription_skipped": "silence",
+            "speech_activity": round(activity, 4)
+        })
+        if self.metrics_enabled:
+            self._write_metrics_line({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "stage": "transcription_skipped",
+                "reason": "silence",
+                "segment_index": metadata.get('segment_index'),
+                "speech_activity": round(activity, 4),
+                "wait_s": round(wait_s, 4)
+            })
+        self.mark_segment_skipped(metadata.get('segment_index'))
+        return True
+
+    def _sum_worker(self, stop_token):
         batch = []
         batch_metadata = []
-        batch_count = 0
-        self._batch_summaries = []
-        while self.running or not self.summarize_queue.empty():
+        batch_tokens = 0
+        batch_started = None
+        batch_count = len(self._batch_summaries)  # non-zero when a session is resumed
+
+        def flush(reason):
+            nonlocal batch, batch_metadata, batch_tokens, batch_started, batch_count
+            if not batch:
+                return
             try:
-                job = self.summarize_queue.get(timeout=1)
-            except queue.Empty:
-                # If not running and queue is empty, flush leftovers
-                if not self.running and batch:
-                    self._process_summary_batch(batch, batch_metadata, batch_count, self._batch_summaries)
-                    batch = []
-                    batch_metadata = []
-                continue
-            segment_path = job['segment_path']
-            transcript = job.get('transcript', '')
-            metadata = job.get('metadata', {})
-            batch.append(transcript)
-            batch_metadata.append(metadata)
-            if len(batch) >= self.summary_batch_size:
-                self._process_summary_batch(batch, batch_metadata, batch_count, self._batch_summaries)
+                summary = self._process_summary_batch(batch, batch_metadata, batch_count, self._batch_summaries,
+                                                      tokens=batch_tokens, reason=reason)
+                self._persist_summary_state()
+                for md in batch_metadata:
+                    if summary:
+                        self._job_update("finish", md.get('sum_job_id'))
+                    else:
+                        self._job_update("fail", md.get('sum_job_id'), "empty summary")
+                if self.summarize_queue.empty():
+                    # Only when caught up: the merges compete with live summaries for Ollama
+                    self._prefetch_summary_tree(self._batch_summaries)
+            except Exception as e:
+                print(f"[Pipeline][ERROR] Summarization of batch {batch_count} failed: {e}")
+                for md in batch_metadata:
+                    self._job_update("fail", md.get('sum_job_id'), e)
+            finally:
+                # Batched items stay pending until their batch is summarized
+                self._add_pending("_sum_pending", -len(batch_metadata))
                 batch = []
                 batch_metadata = []
+                batch_tokens = 0
+                batch_started = None
                 batch_count += 1
-        # After draining, flush any leftovers
-        if batch:
-            self._process_summary_batch(batch, batch_metadata, batch_count, self._batch_summaries)
-            batch = []
-            batch_metadata = []
-        # Synthesize final summary from all batch summaries
-        if self._batch_summaries:
-            self._synthesize_final_summary(self._batch_summaries)
 
-    def _process_summary_batch(self, batch, batch_metadata, batch_count, batch_summaries):
+        while True:
+            # Block until work arrives; a partial batch only needs a wake-up for its max-wait deadline
+            timeout = None
+            if batch and self.summary_max_wait_s:
+                timeout = max(0.05, batch_started + self.summary_max_wait_s - time.monotonic())
+            try:
+                job = self.summarize_queue.get(timeout=timeout)
+            except queue.Empty:
+                # Latency bound: do not hold transcripts back waiting for a full batch
+                flush("max_wait")
+                continue
+            if job is stop_token:
+                break
+            if job is self._FLUSH_BATCH:
+                flush("drain")
+                continue
+            if not isinstance(job, dict):
+                continue  # stale token of an earlier run
+            batched = False
+            try:
+                transcript = job.get('transcript', '')
+                metadata = job.get('metadata', {})
+                self._job_update("start", metadata.get('sum_job_id'), "summarizer")
+                tokens = self._estimate_tokens(transcript)
+                # Under backlog pressure ("bigger_batches") fewer, larger LLM calls are made
+                factor = max(1, int(self.degrade_batch_factor)) if self._degraded("bigger_batches") else 1
+                budget_tokens = self.summary_batch_tokens * factor
+                if budget_tokens:
+                    # Token budget: close the batch before this transcript would overflow it
+                    if batch and batch_tokens + tokens > budget_tokens:
+                        flush("token_budget")
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(transcript)
+                batch_metadata.append(metadata)
+                batch_tokens += tokens
+                batched = True
+                if budget_tokens:
+                    if batch_tokens >= budget_tokens:
+                        flush("token_budget")
+                elif len(batch) >= self.summary_batch_size * factor:
+                    flush("batch_size")
+            except Exception as e:
+                print(f"[Pipeline][ERROR] Summarization worker exception: {e}")
+            finally:
+                if not batched:
+                    self._add_pending("_sum_pending", -1)
+        # Summarize leftovers; the final summary is drain()'s job
+        flush("stop")
+
+    def _degraded(self, step: str) -> bool:
+        """True if degradation step is enabled at the current level."""
+        return self.adaptive_degradation and step in self.degradation_steps[:self.degradation_level]
+
+    def _record_stage_latency(self, stage: str, seconds: float):
+        prev = self._ema_latency.get(stage)
+        self._ema_latency[stage] = seconds if prev is None else self._ema_alpha * seconds + (1 - self._ema_alpha) * prev
+        self._update_degradation()
+
+    def _backlog_seconds(self) -> float:
+        """Estimated seconds of queued work in the slower stage."""
+        workers = self.engine.num_workers if self.engine is not None else len(self.tx_threads)
+        tx = self._queued_transcriptions() * (self._ema_latency.get("transcription") or 0.0) / max(1, workers)
+        sm = self.summarize_queue.qsize() * (self._ema_latency.get("summarization") or 0.0)
+        return max(tx, sm)
+
+    def _update_degradation(self):
+        """Step one degradation level up or down based on the backlog (with hysteresis and cooldown)."""
+        if not self.adaptive_degradation or not self.degradation_steps:
+            return
+        now = time.monotonic()
+        with self._degrade_lock:
+            if now - self._degrade_changed_at < self.degrade_cooldown_s:
+                return
+            backlog_s = self._backlog_seconds()
+            old_level = self.degradation_level
+            if backlog_s > self.degrade_high_backlog_s and old_level < len(self.degradation_steps):
+                new_level = old_level + 1
+            elif backlog_s < self.degrade_low_backlog_s and old_level > 0:
+                new_level = old_level - 1
+            else:
+                return
+            self.degradation_level = new_level
+            self._degrade_changed_at = now
+        step = self.degradation_steps[max(old_level, new_level) - 1]
+        action = "enabling" if new_level > old_level else "disabling"
+        print(f"[Pipeline] Backlog ~{backlog_s:.0f}s: degradation level {old_level} -> {new_level} ({action} {step})")
+        if self.metrics_enabled:
+            self._write_metrics_line({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "stage": "degradation",
+                "from_level": old_level,
+                "to_level": new_level,
+                "step": step,
+                "active_steps": self.degradation_steps[:new_level],
+                "backlog_s": round(backlog_s, 2),
+                "ema_latency_s": {k: round(v, 4) for k, v in self._ema_latency.items()},
+                "queues": {
+                    "transcribe": self._queued_transcriptions(),
+                    "summarize": self.summarize_queue.qsize()
+                }
+            })
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Token count of text using tiktoken when installed (approximates the LLM's tokenizer), else chars/4."""
+        if not text:
+            return 0
+        if self._tokenizer is None:
+            try:
+                self._tokenizer = importlib.import_module('tiktoken').get_encoding(self.tokenizer_encoding)
+            except Exception:
+                self._tokenizer = False
+        if self._tokenizer:
+            try:
+                return len(self._tokenizer.encode(text, disallowed_special=()))
+            except Exception:
+                pass
+        return len(text) // 4
+
+    def _process_summary_batch(self, batch, batch_metadata, batch_count, batch_summaries, tokens=None, reason=None):
         batch_text = '\n\n'.join(batch)
         # Use first segment's metadata for index, etc.
         first_meta = batch_metadata[0] if batch_metadata else {}
         # Summarize the batch
+        start = time.monotonic()
         summary = self.summarize(None, batch_text, first_meta)
+        self._record_stage_latency("summarization", (time.monotonic() - start) / max(1, len(batch)))
         # Save batch summary file
         if self.session_dir:
             summaries_dir = os.path.join(self.session_dir, 'summaries')
@@ -187,30 +869,38 @@ class ProcessingPipeline:
             with open(batch_summary_path, 'w') as f:
                 f.write(summary.strip() + '\n')
         batch_summaries.append(summary)
+        self._processed_sum += len(batch)
         # Metrics: chars and tokens
         if self.metrics_enabled:
             chars = len(batch_text)
-            tokens = chars // 4
             self._write_metrics_line({
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "stage": "summarization_batch",
                 "batch_index": batch_count,
+                "segments": len(batch),
+                "flush_reason": reason,
                 "chars_batch": chars,
-                "tokens_batch": tokens
+                "tokens_batch": tokens if tokens is not None else chars // 4
             })
+        return summary
 
     def _synthesize_final_summary(self, batch_summaries):
         all_text = '\n\n'.join(batch_summaries)
-        prompt = (
-            "You are to write a comprehensive, concise summary of the entire meeting based on the following batch summaries. "
-            "Focus on key decisions, topics, and action items.\n\n"
-            f"Batch Summaries:\n{all_text}\n\nFinal Summary:"
-        )
-        data = {"model": self.ollama_model, "prompt": prompt, "stream": False}
+        # Let a running prefetch finish its merge rather than requesting the same one again
+        prefetch = self._prefetch_thread
+        if prefetch is not None:
+            prefetch.join()
         try:
-            response = requests.post(f"{self.ollama_url}/api/generate", json=data, timeout=600)
-            response.raise_for_status()
-            final_summary = response.json().get("response", "").strip()
+            # Long meetings: merge batch summaries in groups, level by level, until they fit one prompt
+            inputs, levels = self._reduce_summaries(list(batch_summaries))
+            inputs_text = '\n\n'.join(inputs)
+            prompt = (
+                "You are to write a comprehensive, concise summary of the entire meeting based on the following batch summaries. "
+                "Focus on key decisions, topics, and action items.\n\n"
+                f"Batch Summaries:\n{inputs_text}\n\nFinal Summary:"
+            )
+            final_summary = self._ollama_generate(prompt, purpose="final_summary",
+                                                  on_partial=self._write_partial_summary).strip()
             if self.session_dir:
                 summaries_dir = os.path.join(self.session_dir, 'summaries')
                 os.makedirs(summaries_dir, exist_ok=True)
@@ -226,23 +916,140 @@ class ProcessingPipeline:
                     "stage": "final_summary",
                     "chars_final_input": chars,
                     "tokens_final_input": tokens,
+                    "reduce_levels": levels,
+                    "final_prompt_summaries": len(inputs),
                     "chars_final_summary": len(final_summary),
                     "tokens_final_summary": len(final_summary) // 4
                 })
         except Exception as e:
             print(f"[Pipeline][ERROR] Final summary synthesis failed: {e}")
+        finally:
+            self._clear_partial_summary()
+
+    def _reduce_summaries(self, summaries, full_groups_only=False):
+        """Tree-reduce summaries until their text fits final_summary_max_tokens.
+
+        Each level merges consecutive groups of final_summary_fan_in summaries (groups run
+        concurrently against Ollama). Groups always start at index 0, so the same prefix of
+        summaries yields the same groups and therefore the same merged texts: merges computed
+        earlier (by _prefetch_summary_tree() during the meeting, or by a previous run through the
+        summary cache) are reused and only the newest group of each level is new work.
+        With full_groups_only, an incomplete trailing group is left out. Returns (summaries, levels).
+        """
+        fan_in = max(2, int(self.final_summary_fan_in or 2))
+        levels = 0
+        while (self.final_summary_max_tokens and len(summaries) > 1
+               and self._estimate_tokens('\n\n'.join(summaries)) > self.final_summary_max_tokens):
+            if full_groups_only:
+                summaries = summaries[:len(summaries) // fan_in * fan_in]
+                if not summaries:
+                    break
+            groups = [summaries[i:i + fan_in] for i in range(0, len(summaries), fan_in)]
+            summaries = self._merge_summary_groups(groups)
+            levels += 1
+        return summaries, levels
+
+    def _merge_summary_groups(self, groups):
+        with self._merge_lock:
+            results = [self._merge_memo.get(tuple(g)) if len(g) > 1 else g[0] for g in groups]
+        todo = [i for i, r in enumerate(results) if r is None]
+        if todo:
+            workers = max(1, min(int(self.final_summary_workers or 1), len(todo)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary-merge") as pool:
+                for i, merged in zip(todo, pool.map(lambda i: self._merge_summaries(groups[i]), todo)):
+                    results[i] = merged
+        return results
+
+    def _merge_summaries(self, group) -> str:
+        joined = '\n\n'.join(f"Part {i + 1}:\n{text.strip()}" for i, text in enumerate(group))
+        prompt = (
+            "The following are summaries of consecutive parts of one meeting, in order. "
+            "Merge them into a single concise summary that keeps every key decision, topic and action item, "
+            "in chronological order. Output only the merged summary.\n\n"
+            f"{joined}\n\nMerged Summary:"
+        )
+        merged = self._ollama_generate(prompt, purpose="summary_merge").strip()
+        if not merged:
+            # Keep the information rather than dropping a whole subtree
+            merged = '\n\n'.join(group)
+        else:
+            with self._merge_lock:
+                self._merge_memo[tuple(group)] = merged
+        return merged
+
+    def _prefetch_summary_tree(self, batch_summaries):
+        """Compute the merges the final reduction will need while the meeting is still running.
+
+        Runs on a background thread so the summarization worker is not held up; requests made
+        while it is busy are coalesced into one pass over the newest summaries.
+        """
+        if not self.final_summary_max_tokens or len(batch_summaries) < 2:
+            return
+        with self._merge_lock:
+            self._prefetch_pending = list(batch_summaries)
+            if self._prefetch_thread is not None:
+                return
+            self._prefetch_thread = threading.Thread(target=self._prefetch_loop, name="summary-prefetch", daemon=True)
+            self._prefetch_thread.start()
+
+    def _prefetch_loop(self):
+        while True:
+            with self._merge_lock:
+                summaries, self._prefetch_pending = self._prefetch_pending, None
+                if summaries is None:
+                    self._prefetch_thread = None
+                    return
+            try:
+                self._reduce_summaries(summaries, full_groups_only=True)
+            except Exception as e:
+                print(f"[Pipeline][WARN] Summary tree prefetch failed: {e}")
+
+    def drain(self, timeout=None):
+        """Block until every queued job is done, then synthesize final summary and transcript.
+
+        Returns as soon as the last job completes. With `timeout` (seconds) gives up at the deadline
+        and returns False without writing the final outputs; returns True otherwise.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.drain_stage = "waiting"
+        print(f"[Pipeline] Draining: waiting for all queued work to finish "
+              f"(TX:{self._tx_pending} REMOTE:{self._remote_outstanding} SUM:{self._sum_pending} held:{len(self._reorder_buffer)})...")
 
-    def drain(self, poll_interval=1.0):
-        """Block until both queues are empty and both workers are idle. Then synthesize final summary and transcript."""
-        print("[Pipeline] Draining: waiting for all queued work to finish...")
-        while self.running and (not self.is_idle() or not self.transcribe_queue.empty() or not self.summarize_queue.empty()):
-            print(f"[Pipeline] Queues - TX:{self.transcribe_queue.qsize()} SUM:{self.summarize_queue.qsize()} | busy TX:{self._tx_busy} SUM:{self._sum_busy}")
-            time.sleep(poll_interval)
+        def wait_until(done):
+            with self._work_cond:
+                while self.running and not done():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        print(f"[Pipeline][WARN] Drain timed out after {timeout}s "
+                              f"(TX:{self._tx_pending} REMOTE:{self._remote_outstanding} SUM:{self._sum_pending})")
+                        self.drain_stage = "timeout"
+                        return False
+                    self._work_cond.wait(remaining)
+            return True
+
+        while self.running:
+            if not wait_until(self._transcription_idle_locked):
+                return False
+            # Transcription is idle: gaps in the reorder buffer can no longer be filled
+            if self._reorder_buffer:
+                self._flush_reorder_buffer()
+                continue
+            if self._sum_pending:
+                # Queued behind the remaining transcripts: the summarizer then closes its partial batch
+                self.summarize_queue.put(self._FLUSH_BATCH)
+                if not wait_until(lambda: not self._sum_pending or not self._transcription_idle_locked()):
+                    return False
+                continue
+            break
         print("[Pipeline] Drain complete.")
         # Always synthesize final summary and transcript at the end
+        self.drain_stage = "final_transcript"
         self.generate_final_transcript()
         if hasattr(self, '_batch_summaries') and self._batch_summaries:
+            self.drain_stage = "final_summary"
             self._synthesize_final_summary(self._batch_summaries)
+        self.drain_stage = "done"
+        return True
 
     def generate_final_transcript(self):
         """Aggregate all segment transcripts into final_transcript.txt and .json"""
@@ -274,8 +1081,12 @@ class ProcessingPipeline:
             json.dump({'segments': json_segments}, jf, indent=2)
         print(f"[Pipeline] Final transcript written: {txt_out}, {json_out}")
 
+    def _transcription_idle_locked(self):
+        return self._tx_pending == 0 and self._remote_outstanding == 0
+
     def is_idle(self):
-        return (not self._tx_busy) and (not self._sum_busy)
+        with self._work_cond:
+            return self._transcription_idle_locked() and self._sum_pending == 0 and not self._reorder_buffer
 
     def _derive_session_dirs(self, segment_path):
         abs_seg = os.path.abspath(segment_path)
@@ -295,9 +1106,10 @@ class ProcessingPipeline:
             print(f"[Pipeline][WARN] Failed to write metrics line: {e}")
 
     def _ensure_pywhisper_model(self, log_path: Optional[str] = None):
-        """Lazy-load a pywhispercpp model if backend is selected."""
-        if self._pyw_model is not None:
-            return self._pyw_model
+        """Lazy-load a pywhispercpp model if backend is selected (one instance per transcription worker)."""
+        model = getattr(self._worker_local, 'pyw_model', None)
+        if model is not None:
+            return model
         try:
             mod = importlib.import_module('pywhispercpp.model')
             Model = getattr(mod, 'Model')
@@ -309,10 +1121,13 @@ class ProcessingPipeline:
         lang = self.whisper_language
         if lang is None or str(lang).lower() in ("auto", "none"):
             lang = ""
+        # Every transcription worker holds a model: split the CPU threads between them like the process pool
+        workers = len(self.tx_threads) or max(1, int(self.transcription_workers or 1))
+        threads = max(1, int(self.whisper_threads or 1) // workers)
         try:
-            self._pyw_model = Model(
+            model = Model(
                 self.whisper_model,
-                n_threads=self.whisper_threads,
+                n_threads=threads,
                 language=lang,
                 print_realtime=False,
                 print_progress=False,
@@ -321,18 +1136,63 @@ class ProcessingPipeline:
         except Exception as e:
             print(f"[Pipeline][ERROR] Failed to initialize pywhispercpp model: {e}. Falling back to CLI.")
             self.whisper_backend = "cli"
-            self._pyw_model = None
-        return self._pyw_model
+            model = None
+        self._worker_local.pyw_model = model
+        return model
+
+    def _get_pywhisper_pool(self):
+        """Process pool for the pywhispercpp backend, started on first use; None when disabled or unavailable."""
+        if not self.pywhisper_processes:
+            return None
+        with self._pywhisper_pool_lock:
+            if self._pywhisper_pool is None:
+                if importlib.util.find_spec('pywhispercpp') is None:
+                    print("[Pipeline][WARN] pywhispercpp not available; not starting the process pool.")
+                    self.pywhisper_processes = 0
+                    return None
+                lang = self.whisper_language
+                if lang is None or str(lang).lower() in ("auto", "none"):
+                    lang = ""
+                processes = max(1, int(self.pywhisper_processes))
+                threads = max(1, int(self.whisper_threads or 1) // processes)
+                log_path = os.path.join(self.session_dir, 'transcription', 'pywhispercpp.log') if self.session_dir else None
+                print(f"[Pipeline] Starting pywhispercpp pool: {processes} processes x {threads} threads")
+                self._pywhisper_pool = PywhisperPool(self.whisper_model, processes=processes, threads=threads,
+                                                     language=lang, log_path=log_path).start()
+            return self._pywhisper_pool
+
+    def _pywhisper_segments(self, media, log_path: Optional[str] = None):
+        """Compact (t0, t1, text) segments from pywhispercpp, run in the process pool when enabled.
+        Returns None when the backend is unavailable (the caller falls back to the CLI)."""
+        pool = self._get_pywhisper_pool()
+        if pool is not None:
+            try:
+                return pool.transcribe(media)
+            except BrokenProcessPool as e:
+                print(f"[Pipeline][ERROR] pywhispercpp worker process died ({e}); transcribing in process from now on.")
+                with self._pywhisper_pool_lock:
+                    self.pywhisper_processes = 0
+                    self._pywhisper_pool = None
+                pool.close()
+        model = self._ensure_pywhisper_model(log_path=log_path)
+        if model is None:
+            return None
+        return compact_segments(model.transcribe(media))
 
     # Helper: build a context WAV by concatenating optional prev-tail, current segment, and optional silence pad
     def _build_context_wav(self, prev_seg_path: Optional[str], cur_seg_path: str, out_dir: str, base_segment_name: str, override_pad_ms: Optional[int] = None) -> tuple[str, dict]:
         ctx_info = {"used_prev": False, "prev_tail_ms": 0, "pad_ms": 0}
         ctx_wav_path = os.path.join(out_dir, base_segment_name + '_ctx.wav')
         ctx_ffmpeg_log = os.path.join(out_dir, base_segment_name + '_ctx_ffmpeg.log')
+        pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
+        
+        # Fast path: inputs already in whisper format -> slice/concat/pad in process, no ffmpeg
+        native = self._build_context_wav_native(prev_seg_path, cur_seg_path, ctx_wav_path, pad_ms)
+        if native is not None:
+            return native
         
         # Calculate expected segment duration for validation
         expected_duration_s = self._get_wav_duration_seconds(cur_seg_path)
-        pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
         
         # If no pre-roll needed, just copy/pad the current segment
         if not (prev_seg_path and os.path.exists(prev_seg_path) and getattr(self, 'pre_roll_ms', 0) > 0):
@@ -455,6 +1315,151 @@ class ProcessingPipeline:
         
         return ctx_wav_path, ctx_info
 
+    def _build_context_wav_native(self, prev_seg_path: Optional[str], cur_seg_path: str, ctx_wav_path: str, pad_ms: int) -> Optional[tuple[str, dict]]:
+        """Build the context WAV with the wave module when all inputs are 16 kHz mono pcm_s16le.
+        Returns None for non-conforming input so the caller can fall back to ffmpeg."""
+        if not is_whisper_pcm_wav(cur_seg_path):
+            return None
+        use_prev = bool(prev_seg_path and os.path.exists(prev_seg_path) and getattr(self, 'pre_roll_ms', 0) > 0)
+        if use_prev and not is_whisper_pcm_wav(prev_seg_path):
+            return None
+        # Nothing to add: transcribe the segment itself (no copy)
+        if not use_prev and pad_ms <= 0:
+            return cur_seg_path, {"used_prev": False, "prev_tail_ms": 0, "pad_ms": 0}
+        try:
+            prev_tail = self._prev_tail_pcm(prev_seg_path) if use_prev else b""
+            ctx_info = self._write_context_wav_pcm(ctx_wav_path, prev_tail, iter_wav_frames(cur_seg_path), pad_ms)
+        except Exception as e:
+            print(f"[Pipeline][WARN] Native context WAV build failed ({e}), falling back to ffmpeg")
+            try:
+                if os.path.exists(ctx_wav_path):
+                    os.remove(ctx_wav_path)
+            except Exception:
+                pass
+            return None
+        return ctx_wav_path, ctx_info
+
+    def _prev_tail_pcm(self, prev_seg_path: str) -> bytes:
+        """Last pre_roll_ms of a whisper-format WAV as raw PCM"""
+        tail_frames = int(WHISPER_SAMPLE_RATE * max(0.0, float(self.pre_roll_ms)) / 1000.0)
+        with wave.open(prev_seg_path, 'rb') as wf:
+            prev_frames = wf.getnframes()
+        return read_wav_frames(prev_seg_path, start_frame=prev_frames - tail_frames)
+
+    def _pre_roll_tail_pcm(self, pre_roll_pcm: Optional[bytes]) -> bytes:
+        """Last pre_roll_ms of pre-roll PCM handed over in memory (streaming capture)"""
+        if not pre_roll_pcm or getattr(self, 'pre_roll_ms', 0) <= 0:
+            return b""
+        tail_bytes = int(WHISPER_SAMPLE_RATE * float(self.pre_roll_ms) / 1000.0) * WHISPER_SAMPLE_WIDTH
+        return pre_roll_pcm[-tail_bytes:]
+
+    def _write_context_wav_pcm(self, ctx_wav_path, prev_tail: bytes, cur_chunks, pad_ms: int) -> dict:
+        """Write [prev_tail] + current PCM chunks + [pad_ms of silence] as a WAV (path or file object); return ctx_info."""
+        ctx_info = {"used_prev": False, "prev_tail_ms": 0, "pad_ms": 0}
+        if prev_tail:
+            ctx_info["used_prev"] = True
+            ctx_info["prev_tail_ms"] = int(len(prev_tail) // WHISPER_SAMPLE_WIDTH * 1000 / WHISPER_SAMPLE_RATE)
+        pad = b""
+        if pad_ms > 0:
+            pad = bytes(int(WHISPER_SAMPLE_RATE * pad_ms / 1000.0) * WHISPER_SAMPLE_WIDTH)
+            ctx_info["pad_ms"] = pad_ms
+        write_wav_pcm(ctx_wav_path, itertools.chain([prev_tail], cur_chunks, [pad]))
+        return ctx_info
+
+    def _build_context_wav_from_pcm(self, pre_roll_pcm: Optional[bytes], pcm: bytes, out_dir: str, base_segment_name: str, override_pad_ms: Optional[int] = None) -> tuple[str, dict]:
+        """Context WAV for a segment handed over in memory (streaming capture); pre-roll comes from the capture ring."""
+        ctx_wav_path = os.path.join(out_dir, base_segment_name + '_ctx.wav')
+        pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
+        ctx_info = self._write_context_wav_pcm(ctx_wav_path, self._pre_roll_tail_pcm(pre_roll_pcm), [pcm], pad_ms)
+        return ctx_wav_path, ctx_info
+
+    def _build_context_wav_bytes(self, prev_seg_path: Optional[str], cur_seg_path: str, audio: Optional[dict] = None, override_pad_ms: Optional[int] = None) -> Optional[tuple[bytes, dict]]:
+        """Context WAV (prev tail + segment + pad) as in-memory bytes for upload, without touching disk.
+        Returns None when the segment on disk is not whisper-format PCM (caller falls back to a file)."""
+        pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
+        try:
+            if audio is not None:
+                prev_tail = self._pre_roll_tail_pcm(audio.get('pre_roll'))
+                cur_pcm = audio['pcm']
+            else:
+                if not is_whisper_pcm_wav(cur_seg_path):
+                    return None
+                use_prev = bool(prev_seg_path and os.path.exists(prev_seg_path) and getattr(self, 'pre_roll_ms', 0) > 0)
+                if use_prev and not is_whisper_pcm_wav(prev_seg_path):
+                    return None
+                prev_tail = self._prev_tail_pcm(prev_seg_path) if use_prev else b""
+                cur_pcm = read_wav_frames(cur_seg_path)
+            buf = io.BytesIO()
+            ctx_info = self._write_context_wav_pcm(buf, prev_tail, [cur_pcm], pad_ms)
+            return buf.getvalue(), ctx_info
+        except Exception as e:
+            print(f"[Pipeline][WARN] In-memory context build failed ({e}), falling back to context WAV on disk")
+            return None
+
+    def _build_context_array(self, prev_seg_path: Optional[str], cur_seg_path: str, audio: Optional[dict] = None, override_pad_ms: Optional[int] = None):
+        """Context audio (prev tail + segment + pad) as one float32 array in [-1, 1) for pywhispercpp.
+        Source WAVs are memory-mapped, so the only copy made is the output array.
+        Returns None without numpy or for non-whisper-format input (caller falls back to a file)."""
+        try:
+            np = importlib.import_module('numpy')
+        except Exception:
+            return None
+        pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
+
+        def samples(path):
+            hdr = read_wav_header(path)
+            if not hdr or hdr["audio_format"] != 1 or hdr["channels"] != 1 or hdr["sample_rate"] != WHISPER_SAMPLE_RATE or hdr["bits_per_sample"] != 16:
+                return None
+            count = hdr["data_size"] // WHISPER_SAMPLE_WIDTH
+            if count == 0:
+                return np.zeros(0, dtype='<i2')
+            return np.memmap(path, dtype='<i2', mode='r', offset=hdr["data_offset"], shape=(count,))
+
+        try:
+            tail_n = int(WHISPER_SAMPLE_RATE * max(0.0, float(getattr(self, 'pre_roll_ms', 0) or 0)) / 1000.0)
+            if audio is not None:
+                cur = np.frombuffer(audio['pcm'], dtype='<i2')
+                prev = np.frombuffer(audio.get('pre_roll') or b"", dtype='<i2')
+            else:
+                cur = samples(cur_seg_path)
+                if cur is None:
+                    return None
+                prev = np.zeros(0, dtype='<i2')
+                if tail_n > 0 and prev_seg_path and os.path.exists(prev_seg_path):
+                    prev = samples(prev_seg_path)
+                    if prev is None:
+                        return None
+            prev = prev[-tail_n:] if tail_n > 0 else prev[:0]
+            pad_n = int(WHISPER_SAMPLE_RATE * pad_ms / 1000.0)
+            out = np.zeros(len(prev) + len(cur) + pad_n, dtype=np.float32)
+            out[:len(prev)] = prev
+            out[len(prev):len(prev) + len(cur)] = cur
+            out /= 32768.0
+        except Exception as e:
+            print(f"[Pipeline][WARN] Sample-array context build failed ({e}), falling back to context WAV on disk")
+            return None
+        ctx_info = {
+            "used_prev": len(prev) > 0,
+            "prev_tail_ms": int(len(prev) * 1000 / WHISPER_SAMPLE_RATE),
+            "pad_ms": pad_ms if pad_n > 0 else 0
+        }
+        return out, ctx_info
+
+    def _build_context_on_disk(self, prev_seg_path: Optional[str], segment_path_abs: str, audio: Optional[dict], out_dir: str, base_segment_name: str) -> tuple[str, dict]:
+        """Context WAV file for backends that read from disk (CLI, or fallbacks)."""
+        if audio is not None:
+            # In-memory segment (streaming capture): pre-roll travels with the audio, the WAV may not be on disk yet
+            return self._build_context_wav_from_pcm(audio.get('pre_roll'), audio['pcm'], out_dir, base_segment_name)
+        return self._build_context_wav(prev_seg_path, segment_path_abs, out_dir, base_segment_name)
+
+    def _cleanup_context(self, segment_for_whisper, segment_path_abs: str):
+        """Remove a temporary context WAV (in-memory context and the segment itself are left alone)"""
+        try:
+            if isinstance(segment_for_whisper, str) and segment_for_whisper != segment_path_abs and os.path.exists(segment_for_whisper):
+                os.remove(segment_for_whisper)
+        except Exception:
+            pass
+
     def _build_context_wav_fallback(self, cur_seg_path: str, out_dir: str, base_segment_name: str, override_pad_ms: Optional[int] = None) -> tuple[str, dict]:
         """Fallback method that just uses the current segment with optional padding"""
         pad_ms = max(0, int(override_pad_ms if override_pad_ms is not None else (getattr(self, 'pad_silence_ms', 0) or 0)))
@@ -482,7 +1487,7 @@ class ProcessingPipeline:
         return cur_seg_path, {"used_prev": False, "prev_tail_ms": 0, "pad_ms": 0}
 
     # Helper: refine transcript using JSON timestamps to trim pre-roll and clamp to current duration
-    def _refine_transcript_with_json(self, json_path: str, txt_fallback: str, orig_wav_path: str, prev_tail_ms: int) -> str:
+    def _refine_transcript_with_json(self, json_path: str, txt_fallback: str, orig_wav_path: str, prev_tail_ms: int, orig_duration_s: Optional[float] = None) -> str:
         try:
             with open(json_path, 'r', encoding='utf-8') as jf:
                 data = json.load(jf)
@@ -490,7 +1495,7 @@ class ProcessingPipeline:
         except Exception as e:
             print(f"[Pipeline][WARN] Could not read/parse JSON for trimming: {e}")
             return txt_fallback
-        dur_s = self._get_wav_duration_seconds(orig_wav_path) or 0.0
+        dur_s = orig_duration_s or self._get_wav_duration_seconds(orig_wav_path) or 0.0
         keep_txt = []
         kept = 0
         for s in segs:
@@ -519,9 +1524,12 @@ class ProcessingPipeline:
             return txt_fallback
         return '\n'.join(keep_txt)
 
-    # Transcription stage (supports CLI or pywhispercpp backends)
-    def transcribe(self, segment_path, metadata):
-        print(f"[Pipeline] Transcribing {segment_path} with Whisper backend '{self.whisper_backend}' ...")
+    def _prepare_transcription(self, segment_path, metadata, audio=None):
+        """Resolve output paths and build the context audio for one segment.
+
+        Returns a dict with the transcript paths, the whisper input (path, WAV bytes or sample
+        array depending on the backend) and ctx_info; shared by transcribe() and the batched CLI path.
+        """
         segment_path_abs = os.path.abspath(segment_path)
         session_dir, segments_dir, transcription_dir, summaries_dir = self._derive_session_dirs(segment_path_abs)
         os.makedirs(transcription_dir, exist_ok=True)
@@ -530,10 +1538,13 @@ class ProcessingPipeline:
         transcript_txt_path = transcript_base + '.txt'
         transcript_json_path = transcript_base + '.json'
         whisper_log_path = transcript_base + '_whisper.log'
-        transcript_txt = ""
         abs_model_path = os.path.expanduser(self.whisper_model)
         abs_whisper_path = os.path.expanduser(self.whisper_path)
-        # Build context WAV: previous tail + current + optional pad
+        backend = self._whisper_backend()
+        if backend == "cli" and self.degrade_whisper_model and self._degraded("smaller_model"):
+            abs_model_path = os.path.expanduser(self.degrade_whisper_model)
+        # Build context WAV: previous tail + current + optional pad.
+        # The previous segment is looked up on disk, so this works when workers finish out of order.
         prev_seg_path = None
         try:
             idx_str = str(metadata.get('segment_index', '')).strip()
@@ -546,12 +1557,33 @@ class ProcessingPipeline:
                         prev_seg_path = prev_candidate
         except Exception:
             prev_seg_path = None
-        segment_for_whisper, ctx_info = self._build_context_wav(prev_seg_path, segment_path_abs, transcription_dir, base_segment_name)
+        if self._degraded("skip_pre_roll"):
+            prev_seg_path = None
+            if audio is not None:
+                audio = {'pcm': audio['pcm'], 'pre_roll': b""}
+        built = None
+        if backend in ("server", "managed-server"):
+            # Upload straight from memory: no _ctx.wav written, re-read and deleted per segment
+            built = self._build_context_wav_bytes(prev_seg_path, segment_path_abs, audio)
+        elif backend == "pywhispercpp":
+            # Hand pywhispercpp a float32 sample array: no context WAV and no second decode
+            built = self._build_context_array(prev_seg_path, segment_path_abs, audio)
+        if built is not None:
+            segment_for_whisper, ctx_info = built
+        else:
+            segment_for_whisper, ctx_info = self._build_context_on_disk(prev_seg_path, segment_path_abs, audio, transcription_dir, base_segment_name)
+        if audio is not None:
+            orig_duration_s = len(audio['pcm']) / float(WHISPER_SAMPLE_RATE * WHISPER_SAMPLE_WIDTH)
+        else:
+            orig_duration_s = self._get_wav_duration_seconds(segment_path_abs) if os.path.exists(segment_path_abs) else 0.0
+        ctx_info["orig_duration_s"] = round(orig_duration_s, 3)
         
         # Collect context WAV metrics for debugging
-        orig_duration_s = self._get_wav_duration_seconds(segment_path_abs) if os.path.exists(segment_path_abs) else 0.0
         orig_duration_ms = int(orig_duration_s * 1000)
-        ctx_duration_s = self._get_wav_duration_seconds(segment_for_whisper) if os.path.exists(segment_for_whisper) else 0.0
+        if not isinstance(segment_for_whisper, str):
+            ctx_duration_s = orig_duration_s + (ctx_info.get('prev_tail_ms', 0) + ctx_info.get('pad_ms', 0)) / 1000.0
+        else:
+            ctx_duration_s = self._get_wav_duration_seconds(segment_for_whisper) if os.path.exists(segment_for_whisper) else 0.0
         ctx_duration_ms = int(ctx_duration_s * 1000)
         
         # Debug logging for the suspicious duration
@@ -562,18 +1594,8 @@ class ProcessingPipeline:
             print(f"[Pipeline][DEBUG] Duration (s): {orig_duration_s}")
             print(f"[Pipeline][DEBUG] Duration (ms): {orig_duration_ms}")
             
-            # Try alternative duration calculation
-            try:
-                import subprocess
-                result = subprocess.run([
-                    'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-                    '-of', 'csv=p=0', segment_path_abs
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    alt_duration = float(result.stdout.strip())
-                    print(f"[Pipeline][DEBUG] ffprobe duration: {alt_duration:.3f} s")
-            except Exception as e:
-                print(f"[Pipeline][DEBUG] ffprobe failed: {e}")
+            # Dump the raw header fields the duration was derived from
+            print(f"[Pipeline][DEBUG] WAV header: {read_wav_header(segment_path_abs)}")
         
         if self.metrics_enabled:
             self._write_metrics_line({
@@ -583,31 +1605,66 @@ class ProcessingPipeline:
                 "orig_duration_ms": orig_duration_ms,
                 "ctx_duration_ms": ctx_duration_ms,
                 "ctx_info": ctx_info,
-                "ctx_path": segment_for_whisper if segment_for_whisper != segment_path_abs else None
+                "ctx_path": segment_for_whisper if isinstance(segment_for_whisper, str) and segment_for_whisper != segment_path_abs else None
             })
+        return {
+            "segment_path_abs": segment_path_abs,
+            "transcription_dir": transcription_dir,
+            "base_segment_name": base_segment_name,
+            "transcript_base": transcript_base,
+            "transcript_txt_path": transcript_txt_path,
+            "transcript_json_path": transcript_json_path,
+            "whisper_log_path": whisper_log_path,
+            "abs_model_path": abs_model_path,
+            "abs_whisper_path": abs_whisper_path,
+            "prev_seg_path": prev_seg_path,
+            "backend": backend,
+            "segment_for_whisper": segment_for_whisper,
+            "ctx_info": ctx_info,
+            "orig_duration_s": orig_duration_s
+        }
+
+    # Transcription stage (supports CLI or pywhispercpp backends)
+    def transcribe(self, segment_path, metadata, audio=None):
+        print(f"[Pipeline] Transcribing {segment_path} with Whisper backend '{self._whisper_backend()}' ...")
+        job = self._prepare_transcription(segment_path, metadata, audio)
+        cache_key = self._transcript_cache_key(job)
+        cached = self._load_cached_transcript(job, cache_key, metadata)
+        if cached is not None:
+            return cached
+        text = self._transcribe_job(job, audio)
+        self._store_cached_transcript(job, cache_key, text)
+        return text
+
+    def _transcribe_job(self, job, audio=None):
+        """Run the configured backend on a prepared job (see _prepare_transcription)."""
+        segment_path_abs = job["segment_path_abs"]
+        transcription_dir = job["transcription_dir"]
+        base_segment_name = job["base_segment_name"]
+        transcript_base = job["transcript_base"]
+        transcript_txt_path = job["transcript_txt_path"]
+        transcript_json_path = job["transcript_json_path"]
+        whisper_log_path = job["whisper_log_path"]
+        abs_model_path = job["abs_model_path"]
+        abs_whisper_path = job["abs_whisper_path"]
+        prev_seg_path = job["prev_seg_path"]
+        backend = job["backend"]
+        segment_for_whisper = job["segment_for_whisper"]
+        ctx_info = job["ctx_info"]
+        orig_duration_s = job["orig_duration_s"]
         # Backend selection
-        if (self.whisper_backend or "cli").lower() == "pywhispercpp":
+        if backend == "pywhispercpp":
             # In-process transcription via pywhispercpp
             try:
-                model = self._ensure_pywhisper_model(log_path=whisper_log_path)
-                if model is None:
-                    # Fallback initiated inside _ensure_pywhisper_model
+                segments = self._backends()._pywhisper_segments(segment_for_whisper, log_path=whisper_log_path)
+                if segments is None:
+                    # Fallback initiated inside _ensure_pywhisper_model; the CLI needs a file
+                    if not isinstance(segment_for_whisper, str):
+                        segment_for_whisper, ctx_info = self._build_context_on_disk(prev_seg_path, segment_path_abs, audio, transcription_dir, base_segment_name)
+                        ctx_info["orig_duration_s"] = round(orig_duration_s, 3)
                     return self._transcribe_with_cli(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, abs_whisper_path, abs_model_path, ctx_info)
-                segments = model.transcribe(segment_for_whisper)
                 # Build outputs with offsets
-                seg_list = []
-                for seg in segments:
-                    try:
-                        t0 = int(getattr(seg, 't0', 0))
-                        t1 = int(getattr(seg, 't1', 0))
-                        text = str(getattr(seg, 'text', '')).strip()
-                        if text:
-                            seg_list.append({
-                                'text': text,
-                                'offsets': {'from': t0, 'to': t1}
-                            })
-                    except Exception:
-                        continue
+                seg_list = [{'text': text, 'offsets': {'from': t0, 'to': t1}} for t0, t1, text in segments]
                 # First write raw artifacts
                 raw_txt = '\n'.join([s['text'] for s in seg_list])
                 try:
@@ -618,7 +1675,7 @@ class ProcessingPipeline:
                 except Exception as e:
                     print(f"[Pipeline][ERROR] Could not write transcript artifacts: {e}")
                 # Refine (trim pre-roll and clamp end)
-                refined_txt = self._refine_transcript_with_json(transcript_json_path, raw_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0))
+                refined_txt = self._refine_transcript_with_json(transcript_json_path, raw_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0), ctx_info.get('orig_duration_s'))
                 try:
                     if refined_txt and refined_txt != raw_txt:
                         with open(transcript_txt_path, 'w') as tf:
@@ -626,7 +1683,7 @@ class ProcessingPipeline:
                 except Exception as e:
                     print(f"[Pipeline][WARN] Could not write refined transcript: {e}")
                 # Heuristic: compare original duration vs last offset after trimming
-                wav_duration_s = self._get_wav_duration_seconds(segment_path_abs)
+                wav_duration_s = (ctx_info or {}).get('orig_duration_s') or self._get_wav_duration_seconds(segment_path_abs)
                 last_offset_ms = 0
                 if seg_list:
                     last_offset_ms = max([s['offsets']['to'] for s in seg_list]) - int(ctx_info.get('prev_tail_ms', 0))
@@ -638,36 +1695,118 @@ class ProcessingPipeline:
                 return refined_txt or raw_txt
             finally:
                 # Cleanup context temp file if created
-                try:
-                    if segment_for_whisper != segment_path_abs and os.path.exists(segment_for_whisper):
-                        os.remove(segment_for_whisper)
-                except Exception:
-                    pass
-        elif (self.whisper_backend or "cli").lower() == "server":
-            # Server backend: HTTP API calls to whisper.cpp server
+                self._cleanup_context(segment_for_whisper, segment_path_abs)
+        elif backend in ("server", "managed-server"):
+            # Server backend: HTTP API calls to whisper.cpp server (external or managed by the pipeline)
             try:
-                return self._transcribe_with_server(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, ctx_info)
+                server_url = self.whisper_server_url
+                if backend == "managed-server":
+                    server_url = self._backends()._managed_server_url()
+                    if server_url is None:
+                        print("[Pipeline][WARN] Managed whisper.cpp server is down; using CLI for this segment.")
+                        self._cleanup_context(segment_for_whisper, segment_path_abs)
+                        segment_for_whisper, ctx_info = self._build_context_on_disk(prev_seg_path, segment_path_abs, audio, transcription_dir, base_segment_name)
+                        ctx_info["orig_duration_s"] = round(orig_duration_s, 3)
+                        return self._transcribe_with_cli(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, abs_whisper_path, abs_model_path, ctx_info)
+                text = self._transcribe_with_server(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, ctx_info, server_url=server_url)
+                if backend == "managed-server" and not text and not self._backends()._whisper_server.is_running():
+                    # Server died mid-request: restart once and retry this segment
+                    server_url = self._backends()._managed_server_url()
+                    if server_url:
+                        text = self._transcribe_with_server(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, ctx_info, server_url=server_url)
+                return text
             finally:
                 # Cleanup context temp file if created
-                try:
-                    if segment_for_whisper != segment_path_abs and os.path.exists(segment_for_whisper):
-                        os.remove(segment_for_whisper)
-                except Exception:
-                    pass
+                self._cleanup_context(segment_for_whisper, segment_path_abs)
         else:
             # CLI path
             try:
                 return self._transcribe_with_cli(segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, abs_whisper_path, abs_model_path, ctx_info)
             finally:
-                try:
-                    if segment_for_whisper != segment_path_abs and os.path.exists(segment_for_whisper):
-                        os.remove(segment_for_whisper)
-                except Exception:
-                    pass
+                self._cleanup_context(segment_for_whisper, segment_path_abs)
+
+    def _get_transcript_cache(self):
+        if not self.transcript_cache_dir or not self.transcript_cache_max_mb:
+            return None
+        # One instance per directory: each ResultCache keeps its own size accounting
+        with self._transcript_cache_lock:
+            if self._transcript_cache is None:
+                self._transcript_cache = ResultCache(self.transcript_cache_dir, int(self.transcript_cache_max_mb * 1024 * 1024))
+            return self._transcript_cache
+
+    def _transcript_cache_key(self, job) -> Optional[str]:
+        """Hash of the exact audio whisper would see plus every setting that changes its output."""
+        if self._backends()._get_transcript_cache() is None:
+            return None
+        audio_input = job["segment_for_whisper"]
+        h = hashlib.sha256()
+        try:
+            if isinstance(audio_input, str):
+                with open(audio_input, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            elif isinstance(audio_input, (bytes, bytearray)):
+                h.update(audio_input)
+            else:
+                h.update(audio_input.tobytes())  # float32 sample array
+        except Exception as e:
+            print(f"[Pipeline][WARN] Could not hash context audio for the transcript cache: {e}")
+            return None
+        model_path = job["abs_model_path"]
+        try:
+            st = os.stat(model_path)
+            model_id = [model_path, st.st_size, st.st_mtime_ns]
+        except OSError:
+            model_id = [model_path]
+        ctx_info = job["ctx_info"]
+        return ResultCache.make_key("transcript", h.hexdigest(), job["backend"], model_id, self.whisper_language,
+                                    self.pre_roll_ms, self.pad_silence_ms, ctx_info.get('prev_tail_ms', 0),
+                                    ctx_info.get('pad_ms', 0), ctx_info.get('orig_duration_s'))
+
+    def _load_cached_transcript(self, job, cache_key, metadata) -> Optional[str]:
+        """On a cache hit, restore the segment's transcript artifacts and return its text."""
+        if not cache_key:
+            return None
+        entry = self._backends()._get_transcript_cache().get(cache_key)
+        if not entry or not entry.get('transcript'):
+            return None
+        try:
+            if entry.get('json') is not None:
+                with open(job["transcript_json_path"], 'w') as jf:
+                    json.dump(entry['json'], jf, indent=2)
+            with open(job["transcript_txt_path"], 'w') as tf:
+                tf.write(entry['transcript'])
+        except Exception as e:
+            print(f"[Pipeline][WARN] Could not restore cached transcript artifacts: {e}")
+        self._cleanup_context(job["segment_for_whisper"], job["segment_path_abs"])
+        print(f"[Pipeline] Transcript cache hit for {job['segment_path_abs']}")
+        if self.metrics_enabled:
+            self._write_metrics_line({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "stage": "transcript_cache_hit",
+                "segment_index": metadata.get('segment_index'),
+                "key": cache_key
+            })
+        return entry['transcript']
+
+    def _store_cached_transcript(self, job, cache_key, text):
+        if not cache_key or not text:
+            return
+        raw_json = None
+        try:
+            with open(job["transcript_json_path"], 'r', encoding='utf-8') as jf:
+                raw_json = json.load(jf)
+        except Exception:
+            pass
+        self._backends()._get_transcript_cache().put(cache_key, {
+            "segment": os.path.basename(job["segment_path_abs"]),
+            "backend": job["backend"],
+            "json": raw_json,
+            "transcript": text
+        })
 
     def _transcribe_with_cli(self, segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, abs_whisper_path, abs_model_path, ctx_info: dict):
         print(f"[Pipeline] Transcribing {segment_path_abs} with Whisper.cpp CLI (safe blocking call) ...")
-        transcript_txt = ""
         # Build command: write TXT and JSON-full for trimming; keep language/threads and explicit input file
         cmd = [
             abs_whisper_path,
@@ -679,6 +1818,59 @@ class ProcessingPipeline:
             "-l", self.whisper_language,
             "-t", str(self.whisper_threads),
         ]
+        if not self._run_whisper_cli(cmd, [whisper_log_path]):
+            return ""
+        return self._finish_cli_transcript(segment_path_abs, transcript_txt_path, transcript_json_path, ctx_info)
+
+    def transcribe_batch_cli(self, items):
+        """Transcribe several queued (segment_path, metadata, audio) items with one whisper-cli run.
+
+        whisper-cli pairs each -f with the -of at the same position, so every segment still gets its
+        own _transcript.txt/.json, refined individually. Returns transcripts in input order; if the
+        batched run fails, each segment is retried with its own invocation.
+        """
+        if len(items) == 1:
+            segment_path, metadata, audio = items[0]
+            return [self.transcribe(segment_path, metadata, audio=audio)]
+        jobs = []
+        try:
+            results = [None] * len(items)
+            keys = []
+            for i, (segment_path, metadata, audio) in enumerate(items):
+                job = self._prepare_transcription(segment_path, metadata, audio)
+                key = self._transcript_cache_key(job)
+                results[i] = self._load_cached_transcript(job, key, metadata)
+                if results[i] is None:
+                    jobs.append(job)
+                    keys.append((i, key))
+            if not jobs:
+                return results
+            print(f"[Pipeline] Transcribing {len(jobs)} segments in one Whisper.cpp CLI run ...")
+            cmd = [jobs[0]["abs_whisper_path"], "-m", jobs[0]["abs_model_path"]]
+            for job in jobs:
+                cmd += ["-f", job["segment_for_whisper"]]
+            for job in jobs:
+                cmd += ["-of", job["transcript_base"]]
+            cmd += ["-otxt", "-ojf", "-l", self.whisper_language, "-t", str(self.whisper_threads)]
+            batch_ok = self._run_whisper_cli(cmd, [job["whisper_log_path"] for job in jobs])
+            if not batch_ok:
+                print(f"[Pipeline][WARN] Batched whisper-cli run failed; transcribing {len(jobs)} segments one by one.")
+            for job, (i, key) in zip(jobs, keys):
+                if batch_ok:
+                    text = self._finish_cli_transcript(job["segment_path_abs"], job["transcript_txt_path"], job["transcript_json_path"], job["ctx_info"])
+                else:
+                    text = self._transcribe_with_cli(job["segment_path_abs"], job["segment_for_whisper"], job["transcript_base"],
+                                                     job["transcript_txt_path"], job["transcript_json_path"], job["whisper_log_path"],
+                                                     job["abs_whisper_path"], job["abs_model_path"], job["ctx_info"])
+                self._store_cached_transcript(job, key, text)
+                results[i] = text
+            return results
+        finally:
+            for job in jobs:
+                self._cleanup_context(job["segment_for_whisper"], job["segment_path_abs"])
+
+    def _run_whisper_cli(self, cmd, log_paths) -> bool:
+        """Run whisper-cli to completion and write its output to every log in log_paths."""
         try:
             result = subprocess.run(
                 cmd,
@@ -687,25 +1879,24 @@ class ProcessingPipeline:
                 text=True,
                 check=True  # raise on non-zero exit
             )
-            # Write logs after completion
-            try:
-                with open(whisper_log_path, 'w') as lf:
-                    lf.write("COMMAND: " + " ".join(cmd) + "\n\n")
-                    lf.write("STDOUT:\n" + (result.stdout or "") + "\n\n")
-                    lf.write("STDERR:\n" + (result.stderr or "") + "\n")
-            except Exception:
-                pass
+            stdout, stderr, ok = result.stdout, result.stderr, True
         except subprocess.CalledProcessError as e:
-            # Log failure and exit
+            stdout, stderr, ok = e.stdout, e.stderr, False
+            print(f"[Pipeline] Whisper.cpp failed: {e}\nSee log: {log_paths[0]}")
+        # Write logs after completion
+        for log_path in log_paths:
             try:
-                with open(whisper_log_path, 'w') as lf:
+                with open(log_path, 'w') as lf:
                     lf.write("COMMAND: " + " ".join(cmd) + "\n\n")
-                    lf.write("STDOUT:\n" + (e.stdout or "") + "\n\n")
-                    lf.write("STDERR:\n" + (e.stderr or "") + "\n")
+                    lf.write("STDOUT:\n" + (stdout or "") + "\n\n")
+                    lf.write("STDERR:\n" + (stderr or "") + "\n")
             except Exception:
                 pass
-            print(f"[Pipeline] Whisper.cpp failed: {e}\nSee log: {whisper_log_path}")
-            return ""
+        return ok
+
+    def _finish_cli_transcript(self, segment_path_abs, transcript_txt_path, transcript_json_path, ctx_info: dict) -> str:
+        """Read (and refine) the TXT/JSON whisper-cli wrote for one segment."""
+        transcript_txt = ""
         # After process exits successfully, wait for TXT/JSON to materialize & stabilize
         if os.path.exists(transcript_txt_path):
             _ = self.wait_for_file_stable(transcript_txt_path, min_size=16, stable_time=0.5, timeout=15)
@@ -728,7 +1919,7 @@ class ProcessingPipeline:
             return ""
         # Refine with JSON if available (trim pre-roll, clamp end)
         if os.path.exists(transcript_json_path) and ctx_info:
-            refined = self._refine_transcript_with_json(transcript_json_path, transcript_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0))
+            refined = self._refine_transcript_with_json(transcript_json_path, transcript_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0), ctx_info.get('orig_duration_s'))
             try:
                 if refined and refined != transcript_txt:
                     with open(transcript_txt_path, 'w') as tf:
@@ -739,15 +1930,18 @@ class ProcessingPipeline:
         print(f"[Pipeline] Transcript saved: {transcript_txt_path}")
         return transcript_txt
 
-    def _transcribe_with_server(self, segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, ctx_info: dict):
-        """Transcribe using Whisper.cpp HTTP server API"""
+    def _transcribe_with_server(self, segment_path_abs, segment_for_whisper, transcript_base, transcript_txt_path, transcript_json_path, whisper_log_path, ctx_info: dict, server_url: Optional[str] = None):
+        """Transcribe using Whisper.cpp HTTP server API. segment_for_whisper is WAV bytes built in memory
+        (or a file path when the input needed the ffmpeg fallback); the same buffer is reused for the retry."""
         print(f"[Pipeline] Transcribing {segment_path_abs} with Whisper.cpp server API ...")
+        server_url = server_url or self.whisper_server_url
+        if isinstance(segment_for_whisper, bytes):
+            wav_bytes = segment_for_whisper
+        else:
+            with open(segment_for_whisper, 'rb') as audio_file:
+                wav_bytes = audio_file.read()
         
         # Prepare the request data
-        files = {
-            'file': ('audio.wav', open(segment_for_whisper, 'rb'), 'audio/wav')
-        }
-        
         data = {
             'temperature': '0.0',
             'temperature_inc': '0.2',
@@ -760,17 +1954,14 @@ class ProcessingPipeline:
         
         try:
             # Make the HTTP request
-            print(f"[Pipeline] Sending request to {self.whisper_server_url}/inference")
-            response = requests.post(
-                f"{self.whisper_server_url}/inference",
-                files=files,
+            print(f"[Pipeline] Sending request to {server_url}/inference")
+            response = self._backends()._http_session("whisper").post(
+                f"{server_url}/inference",
+                files={'file': ('audio.wav', wav_bytes, 'audio/wav')},
                 data=data,
                 timeout=self.whisper_server_timeout
             )
             
-            # Close the file handle
-            files['file'][1].close()
-            
             # Check response
             response.raise_for_status()
             result_data = response.json()
@@ -778,7 +1969,7 @@ class ProcessingPipeline:
             # Log the request/response
             try:
                 with open(whisper_log_path, 'w') as lf:
-                    lf.write(f"SERVER REQUEST: {self.whisper_server_url}/inference\n")
+                    lf.write(f"SERVER REQUEST: {server_url}/inference\n")
                     lf.write(f"DATA: {data}\n")
                     lf.write(f"STATUS: {response.status_code}\n\n")
                     lf.write("RESPONSE:\n" + json.dumps(result_data, indent=2) + "\n")
@@ -814,7 +2005,7 @@ class ProcessingPipeline:
                 # Simple format: just text field
                 raw_txt = str(result_data.get('text', '')).strip()
                 # Create a single segment covering the whole audio duration
-                wav_duration_s = self._get_wav_duration_seconds(segment_path_abs)
+                wav_duration_s = (ctx_info or {}).get('orig_duration_s') or self._get_wav_duration_seconds(segment_path_abs)
                 if raw_txt:
                     segments = [{
                         'text': raw_txt,
@@ -839,7 +2030,7 @@ class ProcessingPipeline:
             
             # Refine transcript using JSON timestamps to trim pre-roll and clamp end
             if ctx_info and segments:
-                refined_txt = self._refine_transcript_with_json(transcript_json_path, raw_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0))
+                refined_txt = self._refine_transcript_with_json(transcript_json_path, raw_txt, segment_path_abs, ctx_info.get('prev_tail_ms', 0), ctx_info.get('orig_duration_s'))
                 try:
                     if refined_txt and refined_txt != raw_txt:
                         with open(transcript_txt_path, 'w') as tf:
@@ -850,7 +2041,7 @@ class ProcessingPipeline:
             
             # Check for truncation issues (only if we have segments with timestamps)
             if segments and 'end' in segments[0]:
-                wav_duration_s = self._get_wav_duration_seconds(segment_path_abs)
+                wav_duration_s = (ctx_info or {}).get('orig_duration_s') or self._get_wav_duration_seconds(segment_path_abs)
                 last_end_s = max([s['end'] for s in segments])
                 # Adjust for pre-roll
                 last_effective_s = max(0, last_end_s - (ctx_info.get('prev_tail_ms', 0) / 1000.0)) if ctx_info else last_end_s
@@ -862,52 +2053,51 @@ class ProcessingPipeline:
                     # Retry with minimal parameters to avoid truncation
                     retry_data = {'response_format': 'json'}  # Minimal parameters
                     try:
-                        with open(segment_for_whisper, 'rb') as retry_file:
-                            retry_files = {'file': ('audio.wav', retry_file, 'audio/wav')}
+                        retry_files = {'file': ('audio.wav', wav_bytes, 'audio/wav')}
+                        
+                        retry_response = self._backends()._http_session("whisper").post(
+                            f"{server_url}/inference",
+                            files=retry_files,
+                            data=retry_data,
+                            timeout=self.whisper_server_timeout
+                        )
+                        
+                        if retry_response.status_code == 200:
+                            retry_result = retry_response.json()
                             
-                            retry_response = requests.post(
-                                f"{self.whisper_server_url}/inference",
-                                files=retry_files,
-                                data=retry_data,
-                                timeout=self.whisper_server_timeout
-                            )
+                            # Extract text from retry response
+                            retry_text = ""
+                            if 'text' in retry_result:
+                                retry_text = str(retry_result.get('text', '')).strip()
+                            elif 'segments' in retry_result:
+                                retry_segments = retry_result.get('segments', [])
+                                retry_text = '\n'.join([str(s.get('text', '')).strip() for s in retry_segments if s.get('text', '').strip()])
                             
-                            if retry_response.status_code == 200:
-                                retry_result = retry_response.json()
-                                
-                                # Extract text from retry response
-                                retry_text = ""
-                                if 'text' in retry_result:
-                                    retry_text = str(retry_result.get('text', '')).strip()
-                                elif 'segments' in retry_result:
-                                    retry_segments = retry_result.get('segments', [])
-                                    retry_text = '\n'.join([str(s.get('text', '')).strip() for s in retry_segments if s.get('text', '').strip()])
+                            if retry_text and len(retry_text) > len(raw_txt):
+                                print(f"[Pipeline] Retry successful: {len(retry_text)} chars vs {len(raw_txt)} chars")
+                                raw_txt = retry_text
                                 
-                                if retry_text and len(retry_text) > len(raw_txt):
-                                    print(f"[Pipeline] Retry successful: {len(retry_text)} chars vs {len(raw_txt)} chars")
-                                    raw_txt = retry_text
+                                # Update transcript file with retry result
+                                try:
+                                    with open(transcript_txt_path, 'w') as tf:
+                                        tf.write(raw_txt)
+                                    print(f"[Pipeline] Updated transcript with retry result")
+                                except Exception as e:
+                                    print(f"[Pipeline][WARN] Could not update transcript: {e}")
                                     
-                                    # Update transcript file with retry result
-                                    try:
-                                        with open(transcript_txt_path, 'w') as tf:
-                                            tf.write(raw_txt)
-                                        print(f"[Pipeline] Updated transcript with retry result")
-                                    except Exception as e:
-                                        print(f"[Pipeline][WARN] Could not update transcript: {e}")
-                                        
-                                    # Log the retry success
-                                    try:
-                                        with open(whisper_log_path, 'a') as lf:
-                                            lf.write(f"\n\nRETRY SUCCESSFUL:\n")
-                                            lf.write(f"Original: {len(segments)} segments, {len(raw_txt)} chars\n")
-                                            lf.write(f"Retry: {len(retry_text)} chars\n")
-                                    except Exception:
-                                        pass
-                                else:
-                                    print(f"[Pipeline][WARN] Retry did not improve transcript length")
+                                # Log the retry success
+                                try:
+                                    with open(whisper_log_path, 'a') as lf:
+                                        lf.write(f"\n\nRETRY SUCCESSFUL:\n")
+                                        lf.write(f"Original: {len(segments)} segments, {len(raw_txt)} chars\n")
+                                        lf.write(f"Retry: {len(retry_text)} chars\n")
+                                except Exception:
+                                    pass
                             else:
-                                print(f"[Pipeline][WARN] Retry request failed: {retry_response.status_code}")
-                                
+                                print(f"[Pipeline][WARN] Retry did not improve transcript length")
+                        else:
+                            print(f"[Pipeline][WARN] Retry request failed: {retry_response.status_code}")
+                            
                     except Exception as retry_e:
                         print(f"[Pipeline][WARN] Retry attempt failed: {retry_e}")
             
@@ -918,7 +2108,7 @@ class ProcessingPipeline:
             print(f"[Pipeline][ERROR] Whisper server request failed: {e}")
             try:
                 with open(whisper_log_path, 'w') as lf:
-                    lf.write(f"SERVER REQUEST FAILED: {self.whisper_server_url}/inference\n")
+                    lf.write(f"SERVER REQUEST FAILED: {server_url}/inference\n")
                     lf.write(f"ERROR: {e}\n")
                     lf.write(f"DATA: {data}\n")
             except Exception:
@@ -935,16 +2125,16 @@ class ProcessingPipeline:
             return ""
         seg_index = metadata.get('segment_index') if metadata else None
         prev_roll = self.rolling_summary_text or ""
-        # Structured, tagged output to avoid model overwriting issues
-        instruction = (
-            "You are updating a rolling meeting summary and generating a concise per-segment summary. "
-            "Follow the format EXACTLY with the tags. Do not add any other text outside the tags.\n\n"
-            "Inputs:\n"
-            f"- Previous rolling summary (may be empty):\n{prev_roll}\n\n"
-            f"- Current segment transcript:\n{transcript}\n\n"
-            "Tasks:\n"
-            "1) Update the rolling summary so it remains a cohesive, consolidated summary of the entire meeting so far.\n"
-            "2) Produce a concise per-segment summary focusing only on NEW information from this segment.\n\n"
+        # Backlog pressure ("defer_rolling"): only summarize the segment; the rolling summary catches
+        # up from the deferred segment summaries once the pipeline has recovered
+        defer_rolling = self._degraded("defer_rolling")
+        deferred = list(self._deferred_summaries)
+        if deferred and not defer_rolling:
+            prev_roll = (prev_roll + "\n\nSummaries of later segments not yet merged into it:\n"
+                         + "\n\n".join(deferred)).strip()
+        # Structured, tagged output to avoid model overwriting issues.
+        # Fixed instructions come first so consecutive calls share a stable prompt prefix.
+        format_spec = (
             "Output FORMAT (MANDATORY):\n"
             "<<ROLLING_SUMMARY>>\n"
             "<updated rolling summary text here>\n"
@@ -953,25 +2143,68 @@ class ProcessingPipeline:
             "<concise per-segment summary for this segment only>\n"
             "<</SEGMENT_SUMMARY>>\n"
         )
-        prompt = self.system_prompt.strip() + "\n\n" + instruction if self.system_prompt else instruction
-        data = {"model": self.ollama_model, "prompt": prompt, "stream": False}
+        context = None if (defer_rolling or deferred) else self._reusable_ollama_context(transcript)
+        if defer_rolling:
+            self._ollama_context = None
+            instruction = (
+                "Write a concise summary of the following meeting segment transcript, focusing on decisions, "
+                "topics and action items. Follow the format EXACTLY with the tags.\n\n"
+                "Output FORMAT (MANDATORY):\n"
+                "<<SEGMENT_SUMMARY>>\n"
+                "<concise summary for this segment>\n"
+                "<</SEGMENT_SUMMARY>>\n\n"
+                f"Transcript:\n{transcript}\n"
+            )
+            prompt = self.system_prompt.strip() + "\n\n" + instruction if self.system_prompt else instruction
+        elif context is not None:
+            # The model already holds the instructions and its last rolling summary in `context`:
+            # only the new transcript needs to be prefilled
+            prompt = (
+                f"Next segment transcript:\n{transcript}\n\n"
+                "Update your rolling summary with this segment and write the per-segment summary for it. "
+                "Follow the same tags exactly.\n\n" + format_spec
+            )
+        else:
+            instruction = (
+                "You are updating a rolling meeting summary and generating a concise per-segment summary. "
+                "Follow the format EXACTLY with the tags. Do not add any other text outside the tags.\n\n"
+                "Tasks:\n"
+                "1) Update the rolling summary so it remains a cohesive, consolidated summary of the entire meeting so far.\n"
+                "2) Produce a concise per-segment summary focusing only on NEW information from this segment.\n\n"
+                + format_spec + "\n"
+                "Inputs:\n"
+                f"- Previous rolling summary (may be empty):\n{prev_roll}\n\n"
+                f"- Current segment transcript:\n{transcript}\n"
+            )
+            prompt = self.system_prompt.strip() + "\n\n" + instruction if self.system_prompt else instruction
         updated_roll = None
         seg_summary = None
         try:
-            response = requests.post(f"{self.ollama_url}/api/generate", json=data, timeout=300)
-            response.raise_for_status()
-            resp_text = response.json().get("response", "")
+            partial_tags = (("Rolling summary", 'ROLLING_SUMMARY'), ("Segment summary", 'SEGMENT_SUMMARY'))
+            info = {}
+            resp_text = self._ollama_generate(prompt, purpose="segment_summary" if segment_path else "batch_summary",
+                                              on_partial=lambda text: self._write_partial_summary(text, partial_tags),
+                                              context=context, response_info=info)
             # Parse tagged sections
             updated_roll = self._extract_tag(resp_text, 'ROLLING_SUMMARY')
             seg_summary = self._extract_tag(resp_text, 'SEGMENT_SUMMARY')
-            if not updated_roll and prev_roll:
-                # Fallback: keep previous rolling summary if not provided
-                updated_roll = prev_roll
+            # Carry the KV context forward only when the model answered in the expected format
+            if self.ollama_context_tokens and self._extract_tag(resp_text, 'ROLLING_SUMMARY') and info.get('context'):
+                self._ollama_context = info['context']
+            else:
+                self._ollama_context = None
             if not seg_summary:
                 # Fallback: use full response as segment summary
                 seg_summary = resp_text
-            # Persist rolling summary
-            self.rolling_summary_text = updated_roll or seg_summary or prev_roll
+            if defer_rolling:
+                self._deferred_summaries.append(seg_summary.strip())
+            else:
+                if not updated_roll and prev_roll:
+                    # Fallback: keep previous rolling summary if not provided
+                    updated_roll = prev_roll
+                # Persist rolling summary
+                self.rolling_summary_text = updated_roll or seg_summary or prev_roll
+                del self._deferred_summaries[:len(deferred)]
             # Save files only for per-segment summaries
             if segment_path:
                 seg_path_abs = os.path.abspath(segment_path)
@@ -997,7 +2230,178 @@ class ProcessingPipeline:
             return seg_summary
         except Exception as e:
             print(f"[Pipeline][ERROR] Ollama summarization failed: {e}")
+            self._ollama_context = None
+            return ""
+        finally:
+            self._clear_partial_summary()
+
+    def _get_summary_cache(self):
+        if not self.summary_cache_dir or not self.summary_cache_max_mb:
+            return None
+        with self._summary_cache_lock:
+            if self._summary_cache is None:
+                self._summary_cache = ResultCache(self.summary_cache_dir, int(self.summary_cache_max_mb * 1024 * 1024))
+            return self._summary_cache
+
+    def _ollama_generate(self, prompt: str, options: Optional[dict] = None, purpose: str = "summary", on_partial=None,
+                         context: Optional[list] = None, response_info: Optional[dict] = None) -> str:
+        """Streaming /api/generate call memoized on (model, system prompt, prompt, options).
+
+        Tokens are read as Ollama produces them; on_partial(text_so_far) is called at most every
+        0.5 s while generating. The request fails if no data arrives for ollama_idle_timeout
+        seconds, however long the whole generation takes. Identical requests (e.g. merges already
+        computed by the summary-tree prefetch, or a re-run over the same transcripts) are answered
+        from the cache.
+
+        `context` is the token context returned by a previous call: Ollama then continues from that
+        KV state instead of prefilling the conversation again. The final stream message (context,
+        prompt_eval_count, ...) is copied into response_info when given.
+        """
+        cache = self._backends()._get_summary_cache()
+        key = None
+        if cache is not None:
+            key = ResultCache.make_key("ollama_generate", self.ollama_model, self.system_prompt, prompt, options or {}, context or [])
+            entry = cache.get(key)
+            if entry and entry.get('response'):
+                if response_info is not None and entry.get('context'):
+                    response_info['context'] = entry['context']
+                print("[Pipeline] Summary cache hit")
+                if self.metrics_enabled:
+                    self._write_metrics_line({
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "stage": "summary_cache_hit",
+                        "purpose": purpose,
+                        "key": key,
+                        "chars_prompt": len(prompt)
+                    })
+                return entry['response']
+        data = {"model": self.ollama_model, "prompt": prompt, "stream": True}
+        if options:
+            data["options"] = options
+        if self.ollama_keep_alive:
+            data["keep_alive"] = self.ollama_keep_alive  # keep the model (and its prompt cache) resident
+        if context:
+            data["context"] = context
+        # With a shared engine, wait for a fair turn at the Ollama server (least recently served session first)
+        waited = time.monotonic()
+        with (self.engine.llm_slot(self) if self.engine is not None else nullcontext()):
+            llm_wait_s = time.monotonic() - waited
+            start = time.monotonic()
+            first_token_s = None
+            last_partial = 0.0
+            parts = []
+            final = {}
+            try:
+                with self._backends()._http_session("ollama").post(f"{self.ollama_url}/api/generate", json=data, stream=True,
+                                                                   timeout=(10, self.ollama_idle_timeout)) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise RuntimeError(f"Ollama error: {chunk['error']}")
+                        piece = chunk.get("response", "")
+                        if piece:
+                            now = time.monotonic()
+                            if first_token_s is None:
+                                first_token_s = now - start
+                            parts.append(piece)
+                            if on_partial and now - last_partial >= 0.5:
+                                last_partial = now
+                                on_partial(''.join(parts))
+                        if chunk.get("done"):
+                            final = chunk
+                            break
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"Ollama stream failed or stalled (idle timeout {self.ollama_idle_timeout}s, {len(parts)} chunks received): {e}") from e
+        resp_text = ''.join(parts)
+        if response_info is not None:
+            response_info.update(final)
+        if not final:
+            print(f"[Pipeline][WARN] Ollama stream ended without a final 'done' message ({len(resp_text)} chars)")
+        if self.metrics_enabled:
+            eval_count = final.get("eval_count")
+            eval_s = (final.get("eval_duration") or 0) / 1e9
+            self._write_metrics_line({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "stage": "ollama_generate",
+                "purpose": purpose,
+                "model": self.ollama_model,
+                "llm_wait_s": round(llm_wait_s, 4),
+                "ttft_s": round(first_token_s, 4) if first_token_s is not None else None,
+                "wall_s": round(time.monotonic() - start, 4),
+                "total_duration_s": round((final.get("total_duration") or 0) / 1e9, 4),
+                "load_duration_s": round((final.get("load_duration") or 0) / 1e9, 4),
+                "context_tokens_in": len(context) if context else 0,
+                "prompt_eval_count": final.get("prompt_eval_count"),
+                "prompt_eval_s": round((final.get("prompt_eval_duration") or 0) / 1e9, 4),
+                "eval_count": eval_count,
+                "eval_s": round(eval_s, 4),
+                "tokens_per_s": round(eval_count / eval_s, 2) if eval_count and eval_s else None
+            })
+        if key and resp_text.strip() and final:
+            cache.put(key, {"model": self.ollama_model, "response": resp_text, "context": final.get("context")})
+        return resp_text
+
+    def _reusable_ollama_context(self, transcript: str) -> Optional[list]:
+        """Context from the previous summarize() call if the next exchange still fits the token budget."""
+        context = self._ollama_context
+        if not context or not self.ollama_context_tokens:
+            return None
+        # Estimated tokens for the new transcript plus room for the reply
+        projected = len(context) + self._estimate_tokens(transcript) + 1024
+        if projected > self.ollama_context_tokens:
+            print(f"[Pipeline] Ollama context would reach ~{projected} tokens; starting a fresh prompt from the rolling summary.")
+            self._ollama_context = None
+            return None
+        return context
+
+    def _partial_summary_path(self) -> Optional[str]:
+        if not self.session_dir:
+            return None
+        return os.path.join(self.session_dir, 'summaries', 'in_progress.md')
+
+    def _write_partial_summary(self, text: str, tags=None):
+        """Show an in-flight generation in summaries/in_progress.md (tagged sections parsed as they arrive)."""
+        path = self._partial_summary_path()
+        if not path:
+            return
+        if tags:
+            sections = []
+            for title, tag in tags:
+                content = self._extract_partial_tag(text, tag)
+                if content:
+                    sections.append(f"## {title}\n\n{content}\n")
+            body = '\n'.join(sections)
+        else:
+            body = text.strip() + '\n'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("_(generating...)_\n\n" + body)
+        except Exception as e:
+            print(f"[Pipeline][WARN] Could not write partial summary {path}: {e}")
+
+    def _clear_partial_summary(self):
+        path = self._partial_summary_path()
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _extract_partial_tag(self, text: str, tag: str) -> str:
+        """Content after <<TAG>> up to <</TAG>>, or up to the end of text while the tag is still open."""
+        m = re.search(rf"<<{tag}>>\n?", text, re.IGNORECASE)
+        if not m:
             return ""
+        rest = text[m.end():]
+        close = re.search(rf"<</{tag}>>", rest, re.IGNORECASE)
+        if close:
+            return rest[:close.start()].strip()
+        # Drop a closing tag that has only partly arrived
+        return re.sub(r"<{1,2}/?[A-Za-z_]*$", "", rest).strip()
 
     def _extract_tag(self, text: str, tag: str) -> str:
         """Extract content between <<TAG>> and <</TAG>>. Return empty string if not found."""
@@ -1009,28 +2413,8 @@ class ProcessingPipeline:
             return ""
 
     def _get_wav_duration_seconds(self, wav_path: str) -> float:
-        # Use ffprobe for reliable duration calculation
-        try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', wav_path
-            ], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0 and result.stdout.strip():
-                return float(result.stdout.strip())
-        except Exception:
-            pass
-        
-        # Fallback to wave module
-        try:
-            with wave.open(wav_path, 'rb') as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                if rate and frames:
-                    return frames / float(rate)
-        except Exception:
-            pass
-        
-        return 0.0
+        # Header-based, cached by (path, size, mtime); ffprobe only as last resort
+        return get_wav_duration(wav_path)
 
     def save_outputs(self, segment_path, transcript, summary, metadata):
         # No-op: batch and final summary logic handled elsewhere
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-process model, loaded once by _init_worker
+_model = None
+
+
+def compact_segments(segments):
+    """pywhispercpp Segment objects -> [(t0, t1, text)] with empty texts dropped (t0/t1 in 10 ms units)"""
+    out = []
+    for seg in segments:
+        try:
+            text = str(getattr(seg, 'text', '')).strip()
+            if text:
+                out.append((int(getattr(seg, 't0', 0)), int(getattr(seg, 't1', 0)), text))
+        except Exception:
+            continue
+    return out
+
+
+def _init_worker(model_path, n_threads, language, log_path):
+    global _model
+    Model = getattr(importlib.import_module('pywhispercpp.model'), 'Model')
+    _model = Model(
+        model_path,
+        n_threads=n_threads,
+        language=language,
+        print_realtime=False,
+        print_progress=False,
+        redirect_whispercpp_logs_to=(log_path or False)
+    )
+
+
+def _transcribe(media):
+    return compact_segments(_model.transcribe(media))
+
+
+class PywhisperPool:
+    """Process pool running pywhispercpp outside the recorder's interpreter.
+
+    Each of `processes` workers loads the model once at startup with `threads` CPU threads and
+    then receives segments (a float32 sample array or a WAV path) over the executor's queue, so
+    segment iteration and result building do not compete for the recorder's GIL. Results come
+    back as compact (t0, t1, text) tuples.
+    """
+    def __init__(self, model_path, processes=2, threads=2, language="", log_path=None):
+        self.model_path = model_path
+        self.processes = max(1, int(processes))
+        self.threads = max(1, int(threads))
+        self.language = language
+        self.log_path = log_path
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: the recorder's threads (and locks held by them) must not be forked into workers
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(os.path.expanduser(self.model_path), self.threads, self.language, self.log_path)
+                )
+        return self
+
+    def transcribe(self, media):
+        """Blocking: transcribe in the next free worker process; raises BrokenProcessPool if workers died"""
+        return self.start()._executor.submit(_transcribe, media).result()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
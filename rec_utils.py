@@ -4,6 +4,22 @@ import subprocess
 import os
 from datetime import datetime
 import json
+import wave
+import struct
+import sys
+import math
+import threading
+from array import array
+
+try:
+    import numpy as _np  # optional: vectorized level analysis
+except ImportError:
+    _np = None
+
+# Whisper.cpp native input format (what the recorder writes for every segment)
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_SAMPLE_WIDTH = 2  # bytes, pcm_s16le
+WHISPER_CHANNELS = 1
 
 def check_dependencies():
     """Check if required tools are installed"""
@@ -51,20 +67,117 @@ def save_recording_metadata(output_path, metadata):
         print(f"Error saving metadata: {e}")
         return False
 
+def update_recording_metadata(output_path, updates):
+    """Merge updates into the metadata JSON saved alongside a recording"""
+    metadata_path = f"{os.path.splitext(output_path)[0]}.json"
+    metadata = {}
+    try:
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+    except Exception:
+        pass
+    metadata.update(updates)
+    return save_recording_metadata(output_path, metadata)
+
 def get_file_duration(file_path):
-    """Get the duration of an audio file in seconds using ffprobe"""
+    """Get the duration of an audio file in seconds (RIFF header first, ffprobe as last resort)"""
+    duration = get_wav_duration(file_path)
+    return duration if duration > 0 else None
+
+# Duration cache keyed by (path, size, mtime_ns): a changed file gets a fresh entry
+_duration_cache = {}
+_duration_cache_lock = threading.Lock()
+_DURATION_CACHE_MAX = 2048
+
+def read_wav_header(file_path):
+    """Parse the RIFF/WAVE header of file_path without decoding audio.
+
+    Returns a dict with audio_format, channels, sample_rate, block_align, bits_per_sample,
+    data_offset and data_size, or None if the file is not a readable WAV. A data chunk whose
+    declared size is missing or larger than the file (segment still being written) is clamped
+    to the bytes actually on disk.
+    """
     try:
-        cmd = [
-            "ffprobe", "-v", "error", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", file_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout:
+        file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[0:4] not in (b'RIFF', b'RF64') or riff[8:12] != b'WAVE':
+                return None
+            fmt = None
+            while True:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    return None
+                chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+                if chunk_id == b'fmt ':
+                    body = f.read(chunk_size)
+                    if len(body) < 16:
+                        return None
+                    audio_format, channels, sample_rate, _byte_rate, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                    fmt = {
+                        "audio_format": audio_format,
+                        "channels": channels,
+                        "sample_rate": sample_rate,
+                        "block_align": block_align,
+                        "bits_per_sample": bits
+                    }
+                    if chunk_size % 2:
+                        f.seek(1, os.SEEK_CUR)
+                elif chunk_id == b'data':
+                    if fmt is None:
+                        return None
+                    data_offset = f.tell()
+                    available = max(0, file_size - data_offset)
+                    data_size = chunk_size
+                    if data_size in (0, 0xFFFFFFFF) or data_size > available:
+                        data_size = available
+                    fmt["data_offset"] = data_offset
+                    fmt["data_size"] = data_size
+                    return fmt
+                else:
+                    f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+    except Exception:
+        return None
+
+def _ffprobe_duration(file_path):
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
+            '-of', 'csv=p=0', file_path
+        ], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
             return float(result.stdout.strip())
-    except Exception as e:
-        print(f"Error getting file duration: {e}")
-    
-    return None
+    except Exception:
+        pass
+    return 0.0
+
+def get_wav_duration(file_path):
+    """Return the audio duration of file_path in seconds (0.0 if unknown).
+
+    Reads the RIFF header and data size directly; results are cached by (path, size, mtime)
+    so repeated lookups of an unchanged file cost a single stat(). ffprobe is only spawned
+    for files whose header cannot be parsed.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return 0.0
+    key = (os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+    with _duration_cache_lock:
+        cached = _duration_cache.get(key)
+    if cached is not None:
+        return cached
+    duration = 0.0
+    header = read_wav_header(file_path)
+    if header and header["sample_rate"] and header["block_align"]:
+        duration = header["data_size"] / float(header["block_align"] * header["sample_rate"])
+    else:
+        duration = _ffprobe_duration(file_path)
+    with _duration_cache_lock:
+        if len(_duration_cache) >= _DURATION_CACHE_MAX:
+            _duration_cache.clear()
+        _duration_cache[key] = duration
+    return duration
 
 def get_file_size_mb(file_path):
     """Get the file size in MB"""
@@ -130,3 +243,69 @@ def post_process_audio(input_file, output_file=None, noise_reduce=False, normali
     except Exception as e:
         print(f"Error post-processing audio: {e}")
         return False
+
+def is_whisper_pcm_wav(file_path):
+    """Return True if file_path is an uncompressed 16 kHz mono pcm_s16le WAV"""
+    try:
+        with wave.open(file_path, 'rb') as wf:
+            return (wf.getnchannels() == WHISPER_CHANNELS
+                    and wf.getsampwidth() == WHISPER_SAMPLE_WIDTH
+                    and wf.getframerate() == WHISPER_SAMPLE_RATE
+                    and wf.getcomptype() == 'NONE')
+    except Exception:
+        return False
+
+def read_wav_frames(file_path, start_frame=0, nframes=None):
+    """Read raw PCM frames from a WAV file starting at start_frame (all remaining frames if nframes is None)"""
+    with wave.open(file_path, 'rb') as wf:
+        total = wf.getnframes()
+        start_frame = max(0, min(int(start_frame), total))
+        if nframes is None:
+            nframes = total - start_frame
+        wf.setpos(start_frame)
+        return wf.readframes(max(0, int(nframes)))
+
+def iter_wav_frames(file_path, chunk_frames=WHISPER_SAMPLE_RATE * 30):
+    """Yield raw PCM frames from a WAV file in bounded chunks"""
+    with wave.open(file_path, 'rb') as wf:
+        while True:
+            chunk = wf.readframes(chunk_frames)
+            if not chunk:
+                break
+            yield chunk
+
+def write_wav_pcm(file_path, pcm_chunks, sample_rate=WHISPER_SAMPLE_RATE):
+    """Write an iterable of raw pcm_s16le mono byte chunks as a WAV file"""
+    with wave.open(file_path, 'wb') as wf:
+        wf.setnchannels(WHISPER_CHANNELS)
+        wf.setsampwidth(WHISPER_SAMPLE_WIDTH)
+        wf.setframerate(sample_rate)
+        for chunk in pcm_chunks:
+            if chunk:
+                wf.writeframes(chunk)
+
+def pcm_frame_rms(pcm, frame_samples=480):
+    """RMS level (int16 scale) of each complete frame of 16-bit mono PCM (default 30 ms frames at 16 kHz)"""
+    frame_samples = max(1, int(frame_samples))
+    n = len(pcm) // (WHISPER_SAMPLE_WIDTH * frame_samples)
+    if n == 0:
+        return []
+    if _np is not None:
+        frames = _np.frombuffer(pcm, dtype='<i2', count=n * frame_samples).astype(_np.float32).reshape(n, frame_samples)
+        return _np.sqrt((frames * frames).mean(axis=1)).tolist()
+    samples = array('h')
+    samples.frombytes(bytes(pcm[:n * frame_samples * WHISPER_SAMPLE_WIDTH]))
+    if sys.byteorder != 'little':
+        samples.byteswap()
+    levels = []
+    for i in range(n):
+        frame = samples[i * frame_samples:(i + 1) * frame_samples]
+        levels.append(math.sqrt(sum(x * x for x in frame) / frame_samples))
+    return levels
+
+def speech_activity(pcm, threshold_rms, frame_samples=480):
+    """Fraction of frames whose RMS reaches threshold_rms (0.0 for empty input)"""
+    levels = pcm_frame_rms(pcm, frame_samples)
+    if not levels:
+        return 0.0
+    return sum(1 for level in levels if level >= threshold_rms) / float(len(levels))
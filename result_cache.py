@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class ResultCache:
+    """Persistent content-addressed cache of JSON-serializable results.
+
+    Entries live in `cache_dir` as `<key[:2]>/<key>.json`. Reads refresh an entry's mtime, and
+    once the directory grows past `max_bytes` the least recently used entries are deleted until
+    it is back under ~90% of the limit. Safe to share between threads and between processes
+    pointing at the same directory (writes are atomic renames; a missing entry is just a miss).
+    """
+    VERSION = 1
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None  # computed on first put()
+
+    @classmethod
+    def make_key(cls, *parts):
+        """SHA-256 over the given parts; bytes are hashed raw, everything else as canonical JSON"""
+        h = hashlib.sha256(f"v{cls.VERSION}".encode())
+        for part in parts:
+            if isinstance(part, (bytes, bytearray, memoryview)):
+                h.update(b"b")
+                h.update(part)
+            else:
+                h.update(b"j")
+                h.update(json.dumps(part, sort_keys=True, default=str).encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if not self.max_bytes:
+            return False
+        path = self._entry_path(key)
+        try:
+            data = json.dumps(value).encode('utf-8')
+            if len(data) > self.max_bytes:
+                return False
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[Cache][WARN] Could not store entry in {self.cache_dir}: {e}")
+            return False
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+        return True
+
+    def _entries(self):
+        entries = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _mtime, size, _path in self._entries())
+
+    def _evict_locked(self):
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _path in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        self._total_bytes = total
+        if removed:
+            print(f"[Cache] Evicted {removed} least recently used entries from {self.cache_dir}")
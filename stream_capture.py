@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import subprocess
+import threading
+
+from rec_utils import WHISPER_SAMPLE_RATE, WHISPER_SAMPLE_WIDTH, pcm_frame_rms, write_wav_pcm
+
+VAD_FRAME_MS = 30
+
+
+class PcmRingBuffer:
+    """Fixed-size circular buffer of raw pcm_s16le bytes addressed by absolute stream offset.
+
+    Only the most recent `capacity` bytes are retained; older audio has already been
+    handed to the pipeline (and persisted) by the time it is overwritten.
+    """
+    def __init__(self, capacity_bytes):
+        self.capacity = max(WHISPER_SAMPLE_WIDTH, int(capacity_bytes))
+        self._buf = bytearray(self.capacity)
+        self.end = 0  # absolute offset one past the newest byte
+
+    @property
+    def start(self):
+        """Absolute offset of the oldest retained byte"""
+        return max(0, self.end - self.capacity)
+
+    def append(self, data):
+        data = memoryview(data)[-self.capacity:]
+        pos = self.end % self.capacity
+        first = min(len(data), self.capacity - pos)
+        self._buf[pos:pos + first] = data[:first]
+        if first < len(data):
+            self._buf[:len(data) - first] = data[first:]
+        self.end += len(data)
+
+    def slice(self, start, end):
+        """Return bytes in [start, end) that are still retained"""
+        start = max(start, self.start)
+        end = min(end, self.end)
+        if end <= start:
+            return b""
+        a = start % self.capacity
+        b = a + (end - start)
+        if b <= self.capacity:
+            return bytes(self._buf[a:b])
+        return bytes(self._buf[a:]) + bytes(self._buf[:b - self.capacity])
+
+
+class StreamingCapture:
+    """Capture engine: ffmpeg writes raw s16le to stdout, segments are cut in process.
+
+    Each finished segment is handed to `on_segment(index, pcm, pre_roll_pcm, start_s, end_s, info)`
+    immediately (pre-roll comes from the ring, not from disk) and the WAV is written to
+    `segments_dir` by a background writer for archival.
+
+    segmentation="fixed" cuts every `segment_duration` seconds. segmentation="vad" cuts at the
+    pause closest to `segment_duration` within +/- `vad_window_s`, never exceeding
+    `max_segment_s`, and drops leading silence longer than `skip_silence_s` (0 disables).
+    """
+    def __init__(self, input_args, segments_dir, segment_duration, on_segment, pre_roll_ms=300,
+                 on_persisted=None, read_chunk_ms=100, segmentation="fixed", vad_window_s=None,
+                 max_segment_s=None, vad_threshold_rms=400.0, min_pause_ms=300, skip_silence_s=10.0,
+                 log_path=None):
+        self.input_args = list(input_args)
+        self.log_path = log_path  # ffmpeg's stderr (warnings/errors) goes here; discarded when None
+        self.segments_dir = segments_dir
+        self.segment_duration = segment_duration
+        self.on_segment = on_segment
+        self.on_persisted = on_persisted
+        self.pre_roll_ms = max(0, int(pre_roll_ms or 0))
+        self.bytes_per_second = WHISPER_SAMPLE_RATE * WHISPER_SAMPLE_WIDTH
+        self.read_chunk_bytes = max(WHISPER_SAMPLE_WIDTH, int(self.bytes_per_second * read_chunk_ms / 1000.0))
+        # VAD segmentation settings
+        self.segmentation = segmentation
+        self.vad_window_s = float(vad_window_s if vad_window_s is not None else min(30.0, segment_duration * 0.2))
+        self.max_segment_s = float(max_segment_s if max_segment_s is not None else segment_duration + self.vad_window_s)
+        # A maximum below the target would leave no window to cut in
+        self.max_segment_s = max(self.max_segment_s, float(segment_duration))
+        self.vad_threshold_rms = float(vad_threshold_rms)
+        self.min_pause_ms = max(VAD_FRAME_MS, int(min_pause_ms))
+        self.skip_silence_s = max(0.0, float(skip_silence_s or 0))
+        self._frame_bytes = WHISPER_SAMPLE_RATE * VAD_FRAME_MS // 1000 * WHISPER_SAMPLE_WIDTH
+        self._frame_levels = []  # RMS per VAD frame since the current segment start
+        self._silence_skipped = 0  # bytes of leading silence dropped before the current segment
+        # Room for the longest segment, its pre-roll and some slack
+        longest = max(segment_duration, self.max_segment_s)
+        self.ring = PcmRingBuffer(self.bytes_per_second * (2 * longest + 5) + self._pre_roll_bytes())
+        self.process = None
+        self._log_file = None
+        self._reader_thread = None
+        self._writer_thread = None
+        self._write_queue = queue.Queue()
+        self._segment_index = 0
+        self._segment_start = 0  # absolute byte offset where the current segment begins
+
+    def _pre_roll_bytes(self):
+        return int(self.bytes_per_second * self.pre_roll_ms / 1000.0) // WHISPER_SAMPLE_WIDTH * WHISPER_SAMPLE_WIDTH
+
+    def segment_path(self, index):
+        return os.path.join(self.segments_dir, f"segment_{index:03d}.wav")
+
+    def build_command(self):
+        return [
+            "ffmpeg", "-v", "warning", "-nostats",
+            *self.input_args,
+            "-c:a", "pcm_s16le", "-ar", str(WHISPER_SAMPLE_RATE), "-ac", "1",
+            "-f", "s16le", "pipe:1"
+        ]
+
+    def start(self):
+        cmd = self.build_command()
+        if self.log_path:
+            self._log_file = open(self.log_path, 'ab')
+        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=self._log_file or subprocess.DEVNULL)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+        return self.process
+
+    def finish(self, timeout=10):
+        """Wait for the final (partial) segment to be cut and all WAVs to be written.
+        Call after the ffmpeg process has been terminated."""
+        if self._reader_thread:
+            self._reader_thread.join(timeout=timeout)
+        self._write_queue.put(None)
+        if self._writer_thread:
+            self._writer_thread.join(timeout=timeout)
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def error_output(self, max_bytes=4096):
+        """Tail of ffmpeg's logged stderr, e.g. to explain why it exited"""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return ""
+        with open(self.log_path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(self.log_path) - max_bytes))
+            return f.read().decode('utf-8', errors='replace').strip()
+
+    def _reader_loop(self):
+        segment_bytes = int(self.bytes_per_second * self.segment_duration)
+        stdout = self.process.stdout
+        pending = b""
+        while True:
+            data = stdout.read1(self.read_chunk_bytes) if hasattr(stdout, 'read1') else stdout.read(self.read_chunk_bytes)
+            if not data:
+                break
+            # Keep whole samples only
+            data = pending + data
+            cut = len(data) - (len(data) % WHISPER_SAMPLE_WIDTH)
+            pending = data[cut:]
+            self.ring.append(data[:cut])
+            if self.segmentation == "vad":
+                self._vad_step()
+            else:
+                while self.ring.end - self._segment_start >= segment_bytes:
+                    self._cut_segment(self._segment_start + segment_bytes, "fixed")
+        # End of stream: emit the remainder (ignore sub-second slivers and trailing silence)
+        if self.segmentation == "vad":
+            self._update_frame_levels()
+            if not any(level >= self.vad_threshold_rms for level in self._frame_levels):
+                return
+        if self.ring.end - self._segment_start >= self.bytes_per_second // 2:
+            self._cut_segment(self.ring.end, "end")
+
+    def _update_frame_levels(self):
+        """Extend per-frame RMS levels for audio received since the last call"""
+        done = self._segment_start + len(self._frame_levels) * self._frame_bytes
+        whole = (self.ring.end - done) // self._frame_bytes
+        if whole > 0:
+            pcm = self.ring.slice(done, done + whole * self._frame_bytes)
+            self._frame_levels.extend(pcm_frame_rms(pcm, self._frame_bytes // WHISPER_SAMPLE_WIDTH))
+
+    def _vad_step(self):
+        self._update_frame_levels()
+        self._skip_leading_silence()
+        while True:
+            cut = self._find_vad_cut()
+            if cut is None:
+                break
+            self._cut_segment(*cut)
+
+    def _skip_leading_silence(self):
+        if not self.skip_silence_s:
+            return
+        quiet = 0
+        for level in self._frame_levels:
+            if level >= self.vad_threshold_rms:
+                break
+            quiet += 1
+        if quiet * self._frame_bytes < self.skip_silence_s * self.bytes_per_second:
+            return
+        # Keep a short lead-in before the (next) speech onset
+        keep = int(0.5 * self.bytes_per_second) // self._frame_bytes
+        drop = max(0, quiet - keep)
+        self._frame_levels = self._frame_levels[drop:]
+        self._segment_start += drop * self._frame_bytes
+        self._silence_skipped += drop * self._frame_bytes
+
+    def _find_vad_cut(self):
+        """Return (offset, reason) for the next cut, or None to keep accumulating"""
+        fb = self._frame_bytes
+        length = self.ring.end - self._segment_start
+        target = int(self.segment_duration * self.bytes_per_second)
+        # Decide once the whole window around the target is buffered, so pauses after it compete too
+        decide_at = min(target + int(self.vad_window_s * self.bytes_per_second), int(self.max_segment_s * self.bytes_per_second))
+        if length < decide_at:
+            return None
+        lo = max(1, (target - int(self.vad_window_s * self.bytes_per_second)) // fb)
+        hi = min(len(self._frame_levels), int(self.max_segment_s * self.bytes_per_second) // fb)
+        min_run = self.min_pause_ms // VAD_FRAME_MS
+        best = None
+        run_start = None
+        for i in range(lo, hi + 1):
+            quiet = i < hi and self._frame_levels[i] < self.vad_threshold_rms
+            if quiet and run_start is None:
+                run_start = i
+            elif not quiet and run_start is not None:
+                if i - run_start >= min_run:
+                    mid = (run_start + i) // 2
+                    if best is None or abs(mid * fb - target) < abs(best * fb - target):
+                        best = mid
+                run_start = None
+        if best is not None:
+            return self._segment_start + best * fb, "pause"
+        if length >= int(self.max_segment_s * self.bytes_per_second):
+            # Hard maximum: cut at the quietest frame in the window, or at the maximum if it is empty
+            if hi > lo:
+                quietest = min(range(lo, hi), key=lambda i: self._frame_levels[i])
+                return self._segment_start + quietest * fb, "max"
+            return self._segment_start + int(self.max_segment_s * self.bytes_per_second) // fb * fb, "max"
+        return None
+
+    def _cut_segment(self, end_offset, reason="fixed"):
+        start_offset = self._segment_start
+        pcm = self.ring.slice(start_offset, end_offset)
+        pre_roll = self.ring.slice(start_offset - self._pre_roll_bytes(), start_offset) if start_offset > 0 else b""
+        index = self._segment_index
+        self._segment_index += 1
+        info = {"cut": reason}
+        if self.segmentation == "vad":
+            info["silence_skipped_s"] = round(self._silence_skipped / self.bytes_per_second, 3)
+            self._frame_levels = self._frame_levels[(end_offset - start_offset) // self._frame_bytes:]
+            self._silence_skipped = 0
+        self._segment_start = end_offset
+        path = self.segment_path(index)
+        self._write_queue.put((path, pcm))
+        try:
+            self.on_segment(index, pcm, pre_roll, start_offset / self.bytes_per_second, end_offset / self.bytes_per_second, info)
+        except Exception as e:
+            print(f"[Capture][ERROR] Segment hand-off failed for {path}: {e}")
+
+    def _writer_loop(self):
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            path, pcm = item
+            try:
+                # Write then rename so readers never see a half-written segment
+                tmp_path = path + '.part'
+                write_wav_pcm(tmp_path, [pcm])
+                os.replace(tmp_path, path)
+                if self.on_persisted:
+                    self.on_persisted(path)
+            except Exception as e:
+                print(f"[Capture][ERROR] Could not write segment {path}: {e}")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import socket
+import signal
+import sqlite3
+import argparse
+import threading
+import yaml
+
+from job_store import JobStore
+from processing_pipeline import ProcessingPipeline
+
+
+class TranscriptionWorker:
+    """Claims transcription jobs from a shared job store and runs them with a local ProcessingPipeline.
+
+    Recorders started with --remote-transcription only record segments in the store; any number of
+    these workers (on this or other machines sharing the store and the recordings directory) lease
+    jobs, transcribe the segment into its session's transcription/ directory and write the transcript
+    back as the job result. The lease is renewed by a heartbeat while whisper runs, so a worker that
+    dies loses its job to another one once the lease expires.
+    """
+    def __init__(self, job_store_path, pipeline, worker_id=None, lease_s=60.0, poll_interval=2.0,
+                 max_attempts=3, file_timeout=30.0):
+        self.store = JobStore(os.path.expanduser(job_store_path), shared=True)
+        self.pipeline = pipeline
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_s = lease_s
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.file_timeout = file_timeout
+        self.running = False
+        self.processed = 0
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._heartbeat_thread = None
+
+    def run(self, max_jobs=0, exit_when_idle=False):
+        self.running = True
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+        print(f"[Worker {self.worker_id}] Waiting for jobs in {self.store.db_path}")
+        try:
+            while self.running and (not max_jobs or self.processed < max_jobs):
+                try:
+                    jobs = self.store.claim("transcription", self.worker_id, lease_s=self.lease_s,
+                                            max_attempts=self.max_attempts)
+                except sqlite3.Error as e:
+                    # Busy or unreachable shared store: try again on the next poll
+                    print(f"[Worker {self.worker_id}][WARN] Claim failed: {e}")
+                    time.sleep(self.poll_interval)
+                    continue
+                if not jobs:
+                    if exit_when_idle:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                for job in jobs:
+                    self._run_job(job)
+        finally:
+            self.running = False
+            self.store.close()
+        print(f"[Worker {self.worker_id}] Exiting after {self.processed} jobs")
+
+    def stop(self):
+        self.running = False
+
+    def _heartbeat_loop(self):
+        while self.running:
+            time.sleep(max(1.0, self.lease_s / 3.0))
+            with self._held_lock:
+                held = list(self._held)
+            if not held:
+                continue
+            try:
+                still_ours = self.store.heartbeat(held, self.worker_id, lease_s=self.lease_s)
+            except Exception as e:
+                print(f"[Worker {self.worker_id}][WARN] Heartbeat failed: {e}")
+                continue
+            lost = set(held) - set(still_ours)
+            if lost:
+                print(f"[Worker {self.worker_id}][WARN] Lost lease on jobs {sorted(lost)}")
+
+    def _run_job(self, job):
+        segment_path = job["segment_path"]
+        metadata = dict(job["payload"].get("metadata") or {})
+        print(f"[Worker {self.worker_id}] Job {job['id']}: {segment_path} (attempt {job['attempts']})")
+        with self._held_lock:
+            self._held.add(job["id"])
+        try:
+            # Stream-captured segments are persisted by the recorder in the background
+            if not self.pipeline.wait_for_file_stable(segment_path, timeout=self.file_timeout):
+                raise FileNotFoundError(f"segment not available: {segment_path}")
+            if self.pipeline._skip_if_silent(segment_path, metadata, None, 0.0):
+                result = {"skipped": "silence"}
+            else:
+                result = {"transcript": self.pipeline.transcribe(segment_path, metadata)}
+        except Exception as e:
+            print(f"[Worker {self.worker_id}][ERROR] Job {job['id']} failed: {e}")
+            try:
+                if job["attempts"] < self.max_attempts:
+                    updated = self.store.release(job["id"], e, worker=self.worker_id)
+                else:
+                    updated = self.store.fail(job["id"], e, worker=self.worker_id)
+            except sqlite3.Error as store_error:
+                # Left running: the job is claimed again once its lease expires
+                print(f"[Worker {self.worker_id}][WARN] Could not record failure of job {job['id']}: {store_error}")
+                time.sleep(self.poll_interval)
+                return
+            if not updated:
+                print(f"[Worker {self.worker_id}][WARN] Job {job['id']} is no longer ours; leaving it to its new holder")
+        else:
+            try:
+                finished = self.store.finish(job["id"], result, worker=self.worker_id)
+            except sqlite3.Error as e:
+                # Unsaved result: the job is claimed again once its lease expires
+                print(f"[Worker {self.worker_id}][WARN] Could not save result of job {job['id']}: {e}")
+                time.sleep(self.poll_interval)
+                return
+            if finished:
+                self.processed += 1
+            else:
+                # Lease expired and the job was claimed again: the other worker's result counts
+                print(f"[Worker {self.worker_id}][WARN] Job {job['id']} is no longer ours; discarding its result")
+        finally:
+            with self._held_lock:
+                self._held.discard(job["id"])
+
+
+if __name__ == "__main__":
+    # Load config.yaml if present (same keys as meeting_recorder.py)
+    config = {}
+    config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
+    if os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+
+    parser = argparse.ArgumentParser(description="Transcribe segments queued in a shared job store by meeting_recorder.py --remote-transcription")
+    def cfg(key, default):
+        v = config.get(key, default)
+        return None if v == 'null' else v
+
+    parser.add_argument("--job-store", default=cfg("job_store", None), help="Shared SQLite job store (same path the recorder uses with --job-store)")
+    parser.add_argument("--worker-id", default=None, help="Name recorded on claimed jobs (default: hostname:pid)")
+    parser.add_argument("--lease-seconds", type=float, default=cfg("worker_lease_seconds", 60), help="Lease on a claimed job, renewed while it runs; an expired lease lets another worker take the job (default: 60)")
+    parser.add_argument("--poll-interval", type=float, default=cfg("worker_poll_interval", 2), help="Seconds between checks for new jobs when the queue is empty (default: 2)")
+    parser.add_argument("--max-attempts", type=int, default=cfg("worker_max_attempts", 3), help="Mark a job failed after this many attempts (default: 3)")
+    parser.add_argument("--max-jobs", type=int, default=0, help="Exit after this many jobs (default: 0, no limit)")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit as soon as no job is waiting")
+    parser.add_argument("--whisper-backend", choices=["cli", "pywhispercpp", "server", "managed-server"], default=cfg("whisper_backend", "cli"), help="Transcription backend (default: cli)")
+    parser.add_argument("--whisper-path", default=cfg("whisper_path", "/usr/local/bin/whisper"), help="Path to Whisper.cpp executable (default: /usr/local/bin/whisper)")
+    parser.add_argument("--whisper-model", default=cfg("whisper_model", "base"), help="Whisper.cpp model path or size (tiny|base|small|medium|large)")
+    parser.add_argument("--whisper-language", default=cfg("whisper_language", "auto"), help="Language code for Whisper.cpp (default: auto)")
+    parser.add_argument("--whisper-threads", type=int, default=cfg("whisper_threads", 4), help="CPU threads for Whisper.cpp (default: 4)")
+    parser.add_argument("--whisper-server-url", default=cfg("whisper_server_url", "http://127.0.0.1:8080"), help="Whisper.cpp server URL (default: http://127.0.0.1:8080)")
+    parser.add_argument("--whisper-server-path", default=cfg("whisper_server_path", None), help="whisper.cpp server binary for --whisper-backend managed-server")
+    parser.add_argument("--whisper-server-timeout", type=int, default=cfg("whisper_server_timeout", 120), help="Whisper.cpp server timeout in seconds (default: 120)")
+    parser.add_argument("--transcript-cache-dir", default=cfg("transcript_cache_dir", "~/.cache/meeting_recorder/transcripts"), help="Content-addressed cache of whisper results")
+    parser.add_argument("--transcript-cache-mb", type=float, default=cfg("transcript_cache_mb", 512), help="Size limit of the transcript cache in MB (default: 512, 0 disables)")
+    parser.add_argument("--pad-silence-ms", type=int, default=cfg("pad_silence_ms", 300), help="Pad this many milliseconds of trailing silence per segment before transcription (default: 300)")
+    parser.add_argument("--pre-roll-ms", type=int, default=cfg("pre_roll_ms", 300), help="Prepend this many milliseconds from previous segment for transcription context (default: 300)")
+    parser.add_argument("--min-speech-ratio", type=float, default=cfg("min_speech_ratio", 0), help="Skip segments with less than this fraction of voiced 30 ms frames (default: 0, off)")
+    parser.add_argument("--silence-threshold", type=float, default=cfg("silence_threshold", 400.0), help="RMS level (int16 scale) a frame must reach to count as voiced (default: 400)")
+
+    args = parser.parse_args()
+    if not args.job_store:
+        parser.error("--job-store is required (or set job_store in config.yaml)")
+
+    pipeline = ProcessingPipeline(whisper_path=args.whisper_path, whisper_model=args.whisper_model,
+                                  whisper_language=args.whisper_language, whisper_threads=args.whisper_threads)
+    pipeline.whisper_backend = args.whisper_backend
+    pipeline.whisper_server_url = args.whisper_server_url
+    pipeline.whisper_server_timeout = args.whisper_server_timeout
+    pipeline.whisper_server_path = args.whisper_server_path
+    pipeline.transcript_cache_dir = args.transcript_cache_dir
+    pipeline.transcript_cache_max_mb = max(0.0, float(args.transcript_cache_mb or 0))
+    pipeline.pad_silence_ms = max(0, int(args.pad_silence_ms or 0))
+    pipeline.pre_roll_ms = max(0, int(args.pre_roll_ms or 0))
+    pipeline.min_speech_ratio = max(0.0, float(args.min_speech_ratio or 0))
+    pipeline.silence_threshold_rms = float(args.silence_threshold)
+    if pipeline.whisper_backend.lower() == "managed-server":
+        pipeline._start_managed_server()
+
+    worker = TranscriptionWorker(args.job_store, pipeline, worker_id=args.worker_id, lease_s=args.lease_seconds,
+                                 poll_interval=args.poll_interval, max_attempts=max(1, args.max_attempts))
+
+    def _shutdown(sig, frame):
+        print(f"\n[Worker {worker.worker_id}] Finishing current job, then exiting...")
+        worker.stop()
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+
+    try:
+        worker.run(max_jobs=args.max_jobs, exit_when_idle=args.exit_when_idle)
+    finally:
+        pipeline.stop()
+    sys.exit(0)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import subprocess
+import threading
+import time
+
+import requests
+
+
+def find_server_binary(whisper_path):
+    """Locate whisper.cpp's HTTP server next to the configured whisper-cli binary"""
+    bin_dir = os.path.dirname(os.path.expanduser(whisper_path or ""))
+    for name in ("whisper-server", "server"):
+        candidate = os.path.join(bin_dir, name)
+        if bin_dir and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+class WhisperServerManager:
+    """Owns a local whisper.cpp server subprocess so the model stays loaded between segments.
+
+    The server is started on a free loopback port, health-checked before use, restarted if it
+    dies (up to `max_restarts` times) and terminated by stop().
+    """
+    def __init__(self, server_path, model_path, threads=4, language="auto", host="127.0.0.1", port=0,
+                 log_path=None, startup_timeout=120, max_restarts=5):
+        self.server_path = os.path.expanduser(server_path)
+        self.model_path = os.path.expanduser(model_path)
+        self.threads = threads
+        self.language = language
+        self.host = host
+        self.port = port
+        self.log_path = log_path
+        self.startup_timeout = startup_timeout
+        self.max_restarts = max_restarts
+        self.process = None
+        self.restarts = 0
+        self._log_file = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _pick_port(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((self.host, 0))
+            return sock.getsockname()[1]
+
+    def build_command(self):
+        cmd = [
+            self.server_path,
+            "-m", self.model_path,
+            "-t", str(self.threads),
+            "--host", self.host,
+            "--port", str(self.port)
+        ]
+        if self.language and str(self.language).lower() not in ("auto", "none"):
+            cmd += ["-l", str(self.language)]
+        return cmd
+
+    def start(self):
+        """Launch the server and wait until it answers; returns True when it is usable"""
+        with self._lock:
+            return self._start_locked()
+
+    def _start_locked(self):
+        if not self.port:
+            self.port = self._pick_port()
+        cmd = self.build_command()
+        print(f"[WhisperServer] Starting: {' '.join(cmd)}")
+        if self.log_path and self._log_file is None:
+            try:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                self._log_file = open(self.log_path, 'a')
+            except Exception as e:
+                print(f"[WhisperServer][WARN] Could not open log {self.log_path}: {e}")
+        out = self._log_file or subprocess.DEVNULL
+        try:
+            self.process = subprocess.Popen(cmd, stdout=out, stderr=subprocess.STDOUT)
+        except Exception as e:
+            print(f"[WhisperServer][ERROR] Failed to launch {self.server_path}: {e}")
+            self.process = None
+            return False
+        if not self._wait_healthy():
+            print(f"[WhisperServer][ERROR] Server did not become healthy within {self.startup_timeout}s")
+            self._terminate_locked()
+            return False
+        print(f"[WhisperServer] Ready at {self.url} (pid {self.process.pid})")
+        return True
+
+    def _wait_healthy(self):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process is None or self.process.poll() is not None:
+                return False
+            if self.is_healthy():
+                return True
+            time.sleep(0.5)
+        return False
+
+    def is_healthy(self):
+        try:
+            r = requests.get(f"{self.url}/health", timeout=2)
+            if r.status_code == 200:
+                return True
+            # Older servers have no /health; any HTTP answer means the model is loaded
+            if r.status_code == 404:
+                return requests.get(f"{self.url}/", timeout=2).status_code < 500
+        except requests.exceptions.RequestException:
+            pass
+        return False
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def ensure_running(self):
+        """Restart the server if it has exited; returns True if it is (now) running"""
+        with self._lock:
+            if self.is_running():
+                return True
+            if self.process is not None:
+                print(f"[WhisperServer][WARN] Server exited with code {self.process.returncode}")
+            if self.restarts >= self.max_restarts:
+                print(f"[WhisperServer][ERROR] Restart limit ({self.max_restarts}) reached")
+                return False
+            self.restarts += 1
+            # Back off a little on repeated crashes
+            time.sleep(min(10, 2 ** (self.restarts - 1)))
+            return self._start_locked()
+
+    def stop(self):
+        with self._lock:
+            self._terminate_locked()
+            if self._log_file:
+                try:
+                    self._log_file.close()
+                except Exception:
+                    pass
+                self._log_file = None
+
+    def _terminate_locked(self):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None